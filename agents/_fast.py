@@ -0,0 +1,124 @@
+"""
+Insight Generator Hot Paths
+Keyword scanning, ratio interpretation and scoring helpers written to compile
+ahead of time with mypyc: ``mypyc --explicit-package-bases agents/_fast.py``.
+The built extension module is imported in place of this file; without it the
+helpers run as plain Python.
+"""
+
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, FrozenSet, List, Set, Tuple
+
+try:
+    import ahocorasick  # type: ignore
+except ImportError:  # pyahocorasick is optional; fall back to a compiled regex
+    ahocorasick = None
+
+# Keyword vocabularies used when scanning news articles
+GROWTH_KEYWORDS: FrozenSet[str] = frozenset({'expansion', 'growth', 'increase', 'new market', 'acquisition'})
+RISK_KEYWORDS: FrozenSet[str] = frozenset({'risk', 'concern', 'challenge', 'decline', 'loss', 'volatility'})
+POSITIVE_WORDS: FrozenSet[str] = frozenset({'growth', 'profit', 'increase', 'positive', 'strong'})
+NEGATIVE_WORDS: FrozenSet[str] = frozenset({'decline', 'loss', 'negative', 'weak', 'concern'})
+ARTICLE_KEYWORDS: FrozenSet[str] = GROWTH_KEYWORDS | RISK_KEYWORDS | POSITIVE_WORDS | NEGATIVE_WORDS
+
+# Valuation flags returned alongside the interpretation labels
+VAL_UNDER = -1
+VAL_FAIR = 0
+VAL_OVER = 1
+VAL_STRONG_OVER = 2
+
+# Interned interpretation labels, shared by every reading that returns them
+UNDERVALUED = sys.intern('Potentially undervalued')
+FAIRLY_VALUED = sys.intern('Fairly valued')
+OVERVALUED = sys.intern('Potentially overvalued')
+STRONGLY_OVERVALUED = sys.intern('Significantly overvalued')
+
+# Threshold tables: bisect on the thresholds to index the matching label
+_PE_THRESHOLDS = (10, 20, 30)
+_PE_READINGS = (
+    (VAL_UNDER, UNDERVALUED),
+    (VAL_FAIR, FAIRLY_VALUED),
+    (VAL_OVER, OVERVALUED),
+    (VAL_STRONG_OVER, STRONGLY_OVERVALUED)
+)
+_PB_THRESHOLDS = (1, 3)
+_PB_READINGS = (
+    (VAL_UNDER, UNDERVALUED),
+    (VAL_FAIR, FAIRLY_VALUED),
+    (VAL_OVER, OVERVALUED)
+)
+_GROWTH_THRESHOLDS = (0, 10, 20)  # bisect_left: growth must exceed a threshold
+_GROWTH_STRENGTHS = tuple(sys.intern(label) for label in ('declining', 'weak', 'moderate', 'strong'))
+
+def build_keyword_finder(keywords: FrozenSet[str]) -> Callable[[str], Set[str]]:
+    """Build a function returning the set of keywords contained in a lowercased text."""
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        
+        def find_keywords(text: str) -> Set[str]:
+            return {keyword for _, keyword in automaton.iter(text)}
+    elif any(other != keyword and other.startswith(keyword) for keyword in keywords for other in keywords):
+        # A lookahead reports one match per position, so prefix-sharing keywords need separate scans
+        ordered = tuple(keywords)
+        
+        def find_keywords(text: str) -> Set[str]:
+            return {keyword for keyword in ordered if keyword in text}
+    else:
+        # The lookahead reports overlapping matches, mirroring `keyword in text`
+        pattern = re.compile('(?=(' + '|'.join(
+            re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)
+        ) + '))')
+        
+        def find_keywords(text: str) -> Set[str]:
+            return set(pattern.findall(text))
+    return find_keywords
+
+find_article_keywords = build_keyword_finder(ARTICLE_KEYWORDS)
+
+def article_text(article: Dict[str, Any]) -> str:
+    """Lowercased title and description joined into one searchable haystack."""
+    return f"{article.get('title') or ''}\n{article.get('description') or ''}".lower()
+
+def scan_keywords(articles: List[Dict[str, Any]]) -> Tuple[int, int, List[float], List[int]]:
+    """Count growth/risk mentions and collect per-article relevance and sentiment balance."""
+    growth_mentions = 0
+    risk_mentions = 0
+    relevance_scores: List[float] = []
+    sentiment_balance: List[int] = []
+    
+    for article in articles:
+        matched = find_article_keywords(article_text(article))
+        
+        if not matched.isdisjoint(GROWTH_KEYWORDS):
+            growth_mentions += 1
+        
+        if not matched.isdisjoint(RISK_KEYWORDS):
+            risk_mentions += 1
+        
+        relevance_scores.append(float(article.get('relevance_score') or 0))
+        sentiment_balance.append(len(matched & POSITIVE_WORDS) - len(matched & NEGATIVE_WORDS))
+    
+    return growth_mentions, risk_mentions, relevance_scores, sentiment_balance
+
+def interpret_pe_ratio(pe_ratio: float) -> Tuple[int, str]:
+    """Interpret P/E ratio values as a (flag, label) pair."""
+    return _PE_READINGS[bisect_right(_PE_THRESHOLDS, pe_ratio)]
+
+def interpret_pb_ratio(pb_ratio: float) -> Tuple[int, str]:
+    """Interpret price-to-book ratio values as a (flag, label) pair."""
+    return _PB_READINGS[bisect_right(_PB_THRESHOLDS, pb_ratio)]
+
+def assess_growth_strength(growth_rate: float) -> str:
+    """Assess the strength of growth."""
+    return _GROWTH_STRENGTHS[bisect_left(_GROWTH_THRESHOLDS, growth_rate)]
+
+def score_core(valuation: float, growth: float, risk: float,
+               sentiment: float, technical: float) -> float:
+    """Weighted overall score from the component scores."""
+    return (valuation * 0.25 + growth * 0.25 + risk * 0.20 +
+            sentiment * 0.20 + technical * 0.10)
\ No newline at end of file
@@ -5,41 +5,263 @@ Combines news analysis and financial reports to generate comprehensive investmen
 
 import os
 import logging
+import sys
 import json
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from bisect import bisect_right
+from enum import IntEnum
+from collections.abc import Mapping
+from dataclasses import dataclass, field, asdict, is_dataclass
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from config.security import security_manager, rate_limit_decorator, input_validation_decorator
 
+from agents._fast import (
+    GROWTH_KEYWORDS, RISK_KEYWORDS, POSITIVE_WORDS, NEGATIVE_WORDS, ARTICLE_KEYWORDS,
+    VAL_UNDER, VAL_FAIR, VAL_OVER, VAL_STRONG_OVER,
+    scan_keywords, interpret_pe_ratio, interpret_pb_ratio, assess_growth_strength, score_core
+)
+
+# Below this many articles NumPy's per-call overhead outweighs vectorization
+VECTORIZE_MIN_ARTICLES = 64
+
+class Recommendation(IntEnum):
+    """Investment recommendation levels, ordered from bearish to bullish."""
+    SELL = -1
+    HOLD = 0
+    BUY = 1
+    
+    @property
+    def label(self) -> str:
+        return _RECOMMENDATION_LABELS[self]
+
+_RECOMMENDATION_LABELS = {level: sys.intern(level.name.lower()) for level in Recommendation}
+
+# Threshold tables: bisect on the thresholds to index the matching label
+_RECOMMENDATION_THRESHOLDS = (0.3, 0.4, 0.6, 0.7)
+_RECOMMENDATIONS = (
+    (Recommendation.SELL, 'high'),
+    (Recommendation.SELL, 'medium'),
+    (Recommendation.HOLD, 'medium'),
+    (Recommendation.BUY, 'medium'),
+    (Recommendation.BUY, 'high')
+)
+_TIME_HORIZON_THRESHOLDS = (0.5, 0.7)
+_TIME_HORIZONS = ('Short-term (3-6 months)', 'Medium-term (6-18 months)', 'Long-term (2+ years)')
+_POSITION_SIZE_THRESHOLDS = (0.4, 0.6)
+_POSITION_SIZES = (
+    'Avoid or minimal position (<1% of portfolio)',
+    'Small position (1-2% of portfolio)',
+    'Medium position (2-5% of portfolio)'
+)
+
+# (predicate, message) rule tables for key risks and opportunities
+_RISK_RULES = (
+    (lambda ri: ri.overall_risk_level == 'high', 'High overall risk profile'),
+    (lambda ri: ri.market_risk.beta.value > 1.5, 'High market volatility (beta > 1.5)'),
+    (lambda ri: ri.financial_risk.liquidity.risk_level == 'high', 'Liquidity concerns')
+)
+_OPPORTUNITY_RULES = (
+    (lambda gi, si: gi.earnings_growth.strength == 'strong', 'Strong earnings growth trajectory'),
+    (lambda gi, si: si.overall_sentiment == 'positive', 'Positive market sentiment')
+)
+
+_VALUATION_SCORES = {'attractive': 0.8, 'unattractive': 0.2}
+_GROWTH_SCORES = {'strong': 0.8, 'moderate': 0.6, 'weak': 0.4}
+_RISK_SCORES = {'low': 0.2, 'medium': 0.5}
+
+@dataclass(slots=True)
+class MetricReading:
+    """A metric value together with its interpretation."""
+    value: float
+    interpretation: str
+
+@dataclass(slots=True)
+class ValuationMetric:
+    """A valuation ratio with its interpretation and valuation flag."""
+    value: float
+    interpretation: str
+    flag: int = VAL_FAIR
+
+@dataclass(slots=True)
+class ValuationInsights:
+    """Valuation-related insights."""
+    valuation_metrics: Dict[str, ValuationMetric] = field(default_factory=dict)
+    comparative_analysis: Dict[str, Any] = field(default_factory=dict)
+    fair_value_estimate: Optional[float] = None
+    valuation_conclusion: str = 'neutral'
+
+@dataclass(slots=True)
+class EarningsGrowth:
+    """Earnings growth rate and its assessment."""
+    average_growth: float = 0.0
+    trend: str = 'decreasing'
+    strength: str = 'weak'
+
+@dataclass(slots=True)
+class MarketExpansion:
+    """Growth indicators found in news coverage."""
+    growth_mentions: int = 0
+    sentiment: str = 'neutral'
+
+@dataclass(slots=True)
+class GrowthInsights:
+    """Growth-related insights."""
+    earnings_growth: EarningsGrowth = field(default_factory=EarningsGrowth)
+    revenue_growth: Dict[str, Any] = field(default_factory=dict)
+    market_expansion: MarketExpansion = field(default_factory=MarketExpansion)
+    growth_drivers: List[str] = field(default_factory=list)
+    growth_risks: List[str] = field(default_factory=list)
+
+@dataclass(slots=True)
+class LiquidityRisk:
+    """Liquidity risk derived from the current ratio."""
+    current_ratio: float = 0.0
+    risk_level: str = 'medium'
+
+@dataclass(slots=True)
+class FinancialRisk:
+    """Balance-sheet driven risks."""
+    liquidity: LiquidityRisk = field(default_factory=LiquidityRisk)
+
+@dataclass(slots=True)
+class MarketRisk:
+    """Market risks such as volatility relative to the market."""
+    beta: MetricReading = field(default_factory=lambda: MetricReading(1.0, 'Market average'))
+
+@dataclass(slots=True)
+class OperationalRisk:
+    """Operational risks surfaced by news coverage."""
+    news_risk_mentions: int = 0
+
+@dataclass(slots=True)
+class RiskInsights:
+    """Risk-related insights."""
+    financial_risk: FinancialRisk = field(default_factory=FinancialRisk)
+    market_risk: MarketRisk = field(default_factory=MarketRisk)
+    operational_risk: OperationalRisk = field(default_factory=OperationalRisk)
+    regulatory_risk: Dict[str, Any] = field(default_factory=dict)
+    overall_risk_level: str = 'medium'
+
+@dataclass(slots=True)
+class SentimentInsights:
+    """Sentiment-related insights from news analysis."""
+    overall_sentiment: str = 'neutral'
+    sentiment_score: float = 0.0
+    sentiment_trend: str = 'stable'
+    key_sentiment_drivers: List[str] = field(default_factory=list)
+    sentiment_breakdown: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass(slots=True)
+class TechnicalInsights:
+    """Technical analysis insights."""
+    price_trends: Dict[str, Any] = field(default_factory=dict)
+    support_resistance: Dict[str, Any] = field(default_factory=dict)
+    volume_analysis: Dict[str, Any] = field(default_factory=dict)
+    technical_indicators: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass(slots=True)
+class ComprehensiveInsights(Mapping):
+    """Read-only mapping over an insight report whose derived sections are computed on first access."""
+    generated_at: str
+    ticker_symbol: str
+    valuation_insights: ValuationInsights
+    growth_insights: GrowthInsights
+    risk_insights: RiskInsights
+    sentiment_insights: SentimentInsights
+    technical_insights: TechnicalInsights
+    combined_insights: Dict[str, Any]
+    investment_recommendation: Dict[str, Any]
+    _agent: Any = field(default=None, repr=False, compare=False)
+    _cache: Dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+    
+    # Report keys in their serialized order
+    KEYS = (
+        'generated_at', 'ticker_symbol', 'valuation_insights', 'growth_insights',
+        'risk_insights', 'sentiment_insights', 'technical_insights', 'combined_insights',
+        'investment_recommendation', 'confidence_score', 'key_risks', 'opportunities', 'summary'
+    )
+    
+    def _cached(self, name: str, compute) -> Any:
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._cache[name]
+    
+    @property
+    def confidence_score(self) -> float:
+        return self._cached('confidence_score', lambda: self._agent._calculate_confidence_score(
+            self.combined_insights))
+    
+    @property
+    def key_risks(self) -> List[str]:
+        return self._cached('key_risks', lambda: self._agent._identify_key_risks(self.risk_insights))
+    
+    @property
+    def opportunities(self) -> List[str]:
+        return self._cached('opportunities', lambda: self._agent._identify_opportunities(
+            self.growth_insights, self.sentiment_insights))
+    
+    @property
+    def summary(self) -> str:
+        return self._cached('summary', lambda: self._agent._generate_executive_summary(
+            self.combined_insights, self.investment_recommendation))
+    
+    def __getitem__(self, key: str) -> Any:
+        """Dict-style access to report sections, as plain dicts."""
+        if key not in self.KEYS:
+            raise KeyError(key)
+        value = getattr(self, key)
+        return asdict(value) if is_dataclass(value) else value
+    
+    def __iter__(self):
+        return iter(self.KEYS)
+    
+    def __len__(self) -> int:
+        return len(self.KEYS)
+    
+    def __contains__(self, key: object) -> bool:
+        # Membership must not trigger the lazy sections through __getitem__
+        return key in self.KEYS
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the full report, computing any pending derived sections."""
+        return {key: self[key] for key in self.KEYS}
+
 class InsightGeneratorAgent:
     """Agent responsible for generating comprehensive investment insights and recommendations."""
     
+    __slots__ = ('logger',)
+    
+    # Define insight categories
+    insight_categories = (
+        'valuation', 'growth', 'risk', 'opportunity', 'technical',
+        'fundamental', 'sentiment', 'market_timing', 'sector_analysis'
+    )
+    
+    # Risk assessment criteria
+    risk_factors = (
+        'volatility', 'beta', 'debt_levels', 'cash_flow', 'market_cap',
+        'sector_risk', 'geographic_risk', 'regulatory_risk'
+    )
+    
+    # Investment recommendation levels
+    recommendation_levels = (
+        'strong_buy', 'buy', 'hold', 'sell', 'strong_sell'
+    )
+    
     def __init__(self):
         """Initialize the insight generator agent."""
         self.logger = logging.getLogger(__name__)
-        
-        # Define insight categories
-        self.insight_categories = [
-            'valuation', 'growth', 'risk', 'opportunity', 'technical',
-            'fundamental', 'sentiment', 'market_timing', 'sector_analysis'
-        ]
-        
-        # Risk assessment criteria
-        self.risk_factors = [
-            'volatility', 'beta', 'debt_levels', 'cash_flow', 'market_cap',
-            'sector_risk', 'geographic_risk', 'regulatory_risk'
-        ]
-        
-        # Investment recommendation levels
-        self.recommendation_levels = [
-            'strong_buy', 'buy', 'hold', 'sell', 'strong_sell'
-        ]
     
     @rate_limit_decorator
     @input_validation_decorator
     def generate_comprehensive_insights(self, 
                                      news_data: Dict[str, Any],
                                      report_analysis: Dict[str, Any],
-                                     market_context: Dict[str, Any] = None) -> Dict[str, Any]:
+                                     market_context: Dict[str, Any] = None,
+                                     generated_at: Optional[str] = None) -> ComprehensiveInsights:
         """
         Generate comprehensive investment insights from news and report data.
         
@@ -47,22 +269,26 @@ class InsightGeneratorAgent:
             news_data: News analysis results
             report_analysis: Financial report analysis results
             market_context: Additional market context data
+            generated_at: ISO timestamp to stamp the report with; batch callers can
+                pass one shared value instead of reading the clock per ticker
             
         Returns:
-            Dict containing comprehensive insights and recommendations
+            ComprehensiveInsights mapping; call to_dict() or pass default=dict to json.dumps to serialize
         """
         try:
             self.logger.info("Starting comprehensive insight generation")
             
-            # Validate input data
-            if not news_data or not report_analysis:
-                raise ValueError("Both news_data and report_analysis are required")
+            # Validate input shapes once so the helpers can read fields directly
+            self._validate_inputs(news_data, report_analysis)
+            
+            # Scan news articles once for all keyword-driven insights
+            article_scan = self._scan_articles(news_data.get('articles', []))
             
             # Generate different types of insights
             valuation_insights = self._generate_valuation_insights(report_analysis)
-            growth_insights = self._generate_growth_insights(report_analysis, news_data)
-            risk_insights = self._generate_risk_insights(report_analysis, news_data)
-            sentiment_insights = self._generate_sentiment_insights(news_data)
+            growth_insights = self._generate_growth_insights(report_analysis, news_data, article_scan=article_scan)
+            risk_insights = self._generate_risk_insights(report_analysis, news_data, article_scan=article_scan)
+            sentiment_insights = self._generate_sentiment_insights(news_data, article_scan=article_scan)
             technical_insights = self._generate_technical_insights(report_analysis)
             
             # Combine insights for final recommendation
@@ -75,21 +301,18 @@ class InsightGeneratorAgent:
             recommendation = self._generate_investment_recommendation(combined_insights)
             
             # Create comprehensive report
-            comprehensive_insights = {
-                'generated_at': datetime.now().isoformat(),
-                'ticker_symbol': report_analysis.get('ticker_symbol', 'Unknown'),
-                'valuation_insights': valuation_insights,
-                'growth_insights': growth_insights,
-                'risk_insights': risk_insights,
-                'sentiment_insights': sentiment_insights,
-                'technical_insights': technical_insights,
-                'combined_insights': combined_insights,
-                'investment_recommendation': recommendation,
-                'confidence_score': self._calculate_confidence_score(combined_insights),
-                'key_risks': self._identify_key_risks(risk_insights),
-                'opportunities': self._identify_opportunities(growth_insights, sentiment_insights),
-                'summary': self._generate_executive_summary(combined_insights, recommendation)
-            }
+            comprehensive_insights = ComprehensiveInsights(
+                generated_at=generated_at or datetime.now().isoformat(),
+                ticker_symbol=report_analysis.get('ticker_symbol', 'Unknown'),
+                valuation_insights=valuation_insights,
+                growth_insights=growth_insights,
+                risk_insights=risk_insights,
+                sentiment_insights=sentiment_insights,
+                technical_insights=technical_insights,
+                combined_insights=combined_insights,
+                investment_recommendation=recommendation,
+                _agent=self
+            )
             
             self.logger.info("Successfully generated comprehensive insights")
             return comprehensive_insights
@@ -101,276 +324,257 @@ class InsightGeneratorAgent:
             })
             raise
     
-    def _generate_valuation_insights(self, report_analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate valuation-related insights."""
-        insights = {
-            'valuation_metrics': {},
-            'comparative_analysis': {},
-            'fair_value_estimate': None,
-            'valuation_conclusion': 'neutral'
+    def generate_batch(self, items: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+                       max_workers: int = 8) -> List[ComprehensiveInsights]:
+        """
+        Generate insights for many tickers concurrently.
+        
+        Args:
+            items: (news_data, report_analysis) pairs, one per ticker
+            max_workers: Maximum number of worker threads
+        
+        Returns:
+            List of ComprehensiveInsights in the same order as items
+        """
+        # One timestamp for the whole batch
+        generated_at = datetime.now().isoformat()
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda item: self.generate_comprehensive_insights(*item, generated_at=generated_at),
+                items
+            ))
+    
+    def _validate_inputs(self, news_data: Dict[str, Any], report_analysis: Dict[str, Any]):
+        """Check the structure of news and report data before generating insights."""
+        if not news_data or not report_analysis:
+            raise ValueError("Both news_data and report_analysis are required")
+        
+        articles = news_data.get('articles', [])
+        if not isinstance(articles, list) or not all(isinstance(article, dict) for article in articles):
+            raise ValueError("news_data['articles'] must be a list of article dicts")
+        
+        for section in ('company_info', 'financial_analysis', 'earnings_analysis'):
+            if not isinstance(report_analysis.get(section, {}), dict):
+                raise ValueError(f"report_analysis['{section}'] must be a dict")
+        
+        if not isinstance(report_analysis.get('financial_analysis', {}).get('liquidity_metrics', {}), dict):
+            raise ValueError("report_analysis['financial_analysis']['liquidity_metrics'] must be a dict")
+    
+    def _scan_articles(self, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Scan news articles once for growth, risk and sentiment keywords."""
+        scan = {
+            'article_count': len(articles),
+            'growth_mentions': 0,
+            'risk_mentions': 0,
+            'positive': 0.0,
+            'negative': 0.0,
+            'neutral': 0.0
         }
         
-        try:
-            company_info = report_analysis.get('company_info', {})
-            
-            # Analyze P/E ratio
-            pe_ratio = company_info.get('pe_ratio', 0)
-            forward_pe = company_info.get('forward_pe', 0)
-            
-            if pe_ratio > 0:
-                insights['valuation_metrics']['pe_ratio'] = {
-                    'value': pe_ratio,
-                    'interpretation': self._interpret_pe_ratio(pe_ratio)
-                }
-            
-            if forward_pe > 0:
-                insights['valuation_metrics']['forward_pe'] = {
-                    'value': forward_pe,
-                    'interpretation': self._interpret_pe_ratio(forward_pe)
-                }
-            
-            # Analyze price-to-book ratio
-            pb_ratio = company_info.get('price_to_book', 0)
-            if pb_ratio > 0:
-                insights['valuation_metrics']['price_to_book'] = {
-                    'value': pb_ratio,
-                    'interpretation': self._interpret_pb_ratio(pb_ratio)
-                }
-            
-            # Determine overall valuation conclusion
-            insights['valuation_conclusion'] = self._determine_valuation_conclusion(
-                insights['valuation_metrics']
-            )
-            
-        except Exception as e:
-            self.logger.warning(f"Error generating valuation insights: {str(e)}")
+        # Simple sentiment analysis based on keywords, weighted by relevance
+        growth_mentions, risk_mentions, relevance_scores, sentiment_balance = scan_keywords(articles)
+        scan['growth_mentions'] = growth_mentions
+        scan['risk_mentions'] = risk_mentions
+        
+        if len(articles) >= VECTORIZE_MIN_ARTICLES:
+            relevance = np.asarray(relevance_scores, dtype=np.float64)
+            signs = np.sign(np.asarray(sentiment_balance))
+            scan['positive'] = float(relevance[signs > 0].sum())
+            scan['negative'] = float(relevance[signs < 0].sum())
+            scan['neutral'] = float(relevance[signs == 0].sum())
+        else:
+            for relevance_score, balance in zip(relevance_scores, sentiment_balance):
+                if balance > 0:
+                    scan['positive'] += relevance_score
+                elif balance < 0:
+                    scan['negative'] += relevance_score
+                else:
+                    scan['neutral'] += relevance_score
+        
+        return scan
+    
+    def _generate_valuation_insights(self, report_analysis: Dict[str, Any]) -> ValuationInsights:
+        """Generate valuation-related insights."""
+        insights = ValuationInsights()
+        
+        company_info = report_analysis.get('company_info', {})
+        
+        # Analyze P/E ratio
+        pe_ratio = company_info.get('pe_ratio') or 0
+        forward_pe = company_info.get('forward_pe') or 0
+        
+        if pe_ratio > 0:
+            flag, label = self._interpret_pe_ratio(pe_ratio)
+            insights.valuation_metrics['pe_ratio'] = ValuationMetric(pe_ratio, label, flag)
+        
+        if forward_pe > 0:
+            flag, label = self._interpret_pe_ratio(forward_pe)
+            insights.valuation_metrics['forward_pe'] = ValuationMetric(forward_pe, label, flag)
+        
+        # Analyze price-to-book ratio
+        pb_ratio = company_info.get('price_to_book') or 0
+        if pb_ratio > 0:
+            flag, label = self._interpret_pb_ratio(pb_ratio)
+            insights.valuation_metrics['price_to_book'] = ValuationMetric(pb_ratio, label, flag)
+        
+        # Determine overall valuation conclusion
+        insights.valuation_conclusion = self._determine_valuation_conclusion(
+            insights.valuation_metrics
+        )
         
         return insights
     
     def _generate_growth_insights(self, report_analysis: Dict[str, Any], 
-                                news_data: Dict[str, Any]) -> Dict[str, Any]:
+                                news_data: Dict[str, Any],
+                                article_scan: Dict[str, Any] = None) -> GrowthInsights:
         """Generate growth-related insights."""
-        insights = {
-            'earnings_growth': {},
-            'revenue_growth': {},
-            'market_expansion': {},
-            'growth_drivers': [],
-            'growth_risks': []
-        }
+        insights = GrowthInsights()
         
-        try:
-            # Analyze earnings growth
-            earnings_analysis = report_analysis.get('earnings_analysis', {})
-            avg_earnings_growth = earnings_analysis.get('avg_earnings_growth', 0)
-            
-            insights['earnings_growth'] = {
-                'average_growth': avg_earnings_growth,
-                'trend': 'increasing' if avg_earnings_growth > 0 else 'decreasing',
-                'strength': self._assess_growth_strength(avg_earnings_growth)
-            }
-            
-            # Analyze news sentiment for growth indicators
-            news_articles = news_data.get('articles', [])
-            growth_keywords = ['expansion', 'growth', 'increase', 'new market', 'acquisition']
-            
-            growth_mentions = 0
-            for article in news_articles:
-                title = article.get('title', '').lower()
-                description = article.get('description', '').lower()
-                
-                for keyword in growth_keywords:
-                    if keyword in title or keyword in description:
-                        growth_mentions += 1
-                        break
-            
-            insights['market_expansion'] = {
-                'growth_mentions': growth_mentions,
-                'sentiment': 'positive' if growth_mentions > len(news_articles) * 0.3 else 'neutral'
-            }
-            
-        except Exception as e:
-            self.logger.warning(f"Error generating growth insights: {str(e)}")
+        # Analyze earnings growth
+        earnings_analysis = report_analysis.get('earnings_analysis', {})
+        avg_earnings_growth = earnings_analysis.get('avg_earnings_growth') or 0
+        
+        insights.earnings_growth = EarningsGrowth(
+            average_growth=avg_earnings_growth,
+            trend='increasing' if avg_earnings_growth > 0 else 'decreasing',
+            strength=self._assess_growth_strength(avg_earnings_growth)
+        )
+        
+        # Analyze news sentiment for growth indicators
+        if article_scan is None:
+            article_scan = self._scan_articles(news_data.get('articles', []))
+        growth_mentions = article_scan['growth_mentions']
+        
+        insights.market_expansion = MarketExpansion(
+            growth_mentions=growth_mentions,
+            sentiment='positive' if growth_mentions > article_scan['article_count'] * 0.3 else 'neutral'
+        )
         
         return insights
     
     def _generate_risk_insights(self, report_analysis: Dict[str, Any], 
-                              news_data: Dict[str, Any]) -> Dict[str, Any]:
+                              news_data: Dict[str, Any],
+                              article_scan: Dict[str, Any] = None) -> RiskInsights:
         """Generate risk-related insights."""
-        insights = {
-            'financial_risk': {},
-            'market_risk': {},
-            'operational_risk': {},
-            'regulatory_risk': {},
-            'overall_risk_level': 'medium'
-        }
+        insights = RiskInsights()
         
-        try:
-            company_info = report_analysis.get('company_info', {})
-            financial_analysis = report_analysis.get('financial_analysis', {})
-            
-            # Analyze beta for market risk
-            beta = company_info.get('beta', 1.0)
-            insights['market_risk']['beta'] = {
-                'value': beta,
-                'interpretation': 'High volatility' if beta > 1.5 else 'Low volatility' if beta < 0.8 else 'Market average'
-            }
-            
-            # Analyze liquidity risk
-            liquidity_metrics = financial_analysis.get('liquidity_metrics', {})
-            current_ratio = liquidity_metrics.get('current_ratio', 0)
-            
-            insights['financial_risk']['liquidity'] = {
-                'current_ratio': current_ratio,
-                'risk_level': 'high' if current_ratio < 1 else 'low' if current_ratio > 2 else 'medium'
-            }
-            
-            # Analyze news for risk indicators
-            risk_keywords = ['risk', 'concern', 'challenge', 'decline', 'loss', 'volatility']
-            risk_mentions = 0
-            
-            news_articles = news_data.get('articles', [])
-            for article in news_articles:
-                title = article.get('title', '').lower()
-                description = article.get('description', '').lower()
-                
-                for keyword in risk_keywords:
-                    if keyword in title or keyword in description:
-                        risk_mentions += 1
-                        break
-            
-            insights['operational_risk']['news_risk_mentions'] = risk_mentions
-            
-            # Determine overall risk level
-            insights['overall_risk_level'] = self._determine_overall_risk_level(insights)
-            
-        except Exception as e:
-            self.logger.warning(f"Error generating risk insights: {str(e)}")
+        company_info = report_analysis.get('company_info', {})
+        financial_analysis = report_analysis.get('financial_analysis', {})
+        
+        # Analyze beta for market risk
+        beta = company_info.get('beta')
+        if beta is None:
+            beta = 1.0
+        insights.market_risk.beta = MetricReading(
+            beta,
+            'High volatility' if beta > 1.5 else 'Low volatility' if beta < 0.8 else 'Market average'
+        )
+        
+        # Analyze liquidity risk
+        liquidity_metrics = financial_analysis.get('liquidity_metrics', {})
+        current_ratio = liquidity_metrics.get('current_ratio') or 0
+        
+        insights.financial_risk.liquidity = LiquidityRisk(
+            current_ratio=current_ratio,
+            risk_level='high' if current_ratio < 1 else 'low' if current_ratio > 2 else 'medium'
+        )
+        
+        # Analyze news for risk indicators
+        if article_scan is None:
+            article_scan = self._scan_articles(news_data.get('articles', []))
+        
+        insights.operational_risk.news_risk_mentions = article_scan['risk_mentions']
+        
+        # Determine overall risk level
+        insights.overall_risk_level = self._determine_overall_risk_level(insights)
         
         return insights
     
-    def _generate_sentiment_insights(self, news_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_sentiment_insights(self, news_data: Dict[str, Any],
+                                   article_scan: Dict[str, Any] = None) -> SentimentInsights:
         """Generate sentiment-related insights from news analysis."""
-        insights = {
-            'overall_sentiment': 'neutral',
-            'sentiment_score': 0.0,
-            'sentiment_trend': 'stable',
-            'key_sentiment_drivers': [],
-            'sentiment_breakdown': {}
-        }
-        
-        try:
-            articles = news_data.get('articles', [])
-            if not articles:
-                return insights
-            
-            # Calculate sentiment scores
-            positive_count = 0
-            negative_count = 0
-            neutral_count = 0
-            
-            for article in articles:
-                relevance_score = article.get('relevance_score', 0)
-                title = article.get('title', '').lower()
-                description = article.get('description', '').lower()
-                
-                # Simple sentiment analysis based on keywords
-                positive_words = ['growth', 'profit', 'increase', 'positive', 'strong']
-                negative_words = ['decline', 'loss', 'negative', 'weak', 'concern']
-                
-                positive_matches = sum(1 for word in positive_words if word in title or word in description)
-                negative_matches = sum(1 for word in negative_words if word in title or word in description)
-                
-                if positive_matches > negative_matches:
-                    positive_count += relevance_score
-                elif negative_matches > positive_matches:
-                    negative_count += relevance_score
-                else:
-                    neutral_count += relevance_score
-            
-            # Calculate overall sentiment
-            total_score = positive_count + negative_count + neutral_count
-            if total_score > 0:
-                sentiment_score = (positive_count - negative_count) / total_score
-                insights['sentiment_score'] = sentiment_score
-                
-                if sentiment_score > 0.2:
-                    insights['overall_sentiment'] = 'positive'
-                elif sentiment_score < -0.2:
-                    insights['overall_sentiment'] = 'negative'
-                else:
-                    insights['overall_sentiment'] = 'neutral'
-            
-        except Exception as e:
-            self.logger.warning(f"Error generating sentiment insights: {str(e)}")
+        insights = SentimentInsights()
+        
+        if article_scan is None:
+            article_scan = self._scan_articles(news_data.get('articles', []))
+        if not article_scan['article_count']:
+            return insights
+        
+        # Relevance-weighted sentiment scores
+        positive_count = article_scan['positive']
+        negative_count = article_scan['negative']
+        neutral_count = article_scan['neutral']
+        
+        # Calculate overall sentiment
+        total_score = positive_count + negative_count + neutral_count
+        if total_score > 0:
+            sentiment_score = (positive_count - negative_count) / total_score
+            insights.sentiment_score = sentiment_score
+            
+            if sentiment_score > 0.2:
+                insights.overall_sentiment = 'positive'
+            elif sentiment_score < -0.2:
+                insights.overall_sentiment = 'negative'
+            else:
+                insights.overall_sentiment = 'neutral'
         
         return insights
     
-    def _generate_technical_insights(self, report_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_technical_insights(self, report_analysis: Dict[str, Any]) -> TechnicalInsights:
         """Generate technical analysis insights."""
-        insights = {
-            'price_trends': {},
-            'support_resistance': {},
-            'volume_analysis': {},
-            'technical_indicators': {}
+        insights = TechnicalInsights()
+        
+        # This would typically involve technical analysis libraries
+        # For now, we'll provide a basic structure
+        insights.price_trends = {
+            'current_trend': 'neutral',
+            'trend_strength': 'medium',
+            'price_momentum': 'stable'
         }
         
-        try:
-            # This would typically involve technical analysis libraries
-            # For now, we'll provide a basic structure
-            insights['price_trends'] = {
-                'current_trend': 'neutral',
-                'trend_strength': 'medium',
-                'price_momentum': 'stable'
-            }
-            
-        except Exception as e:
-            self.logger.warning(f"Error generating technical insights: {str(e)}")
-        
         return insights
     
-    def _combine_insights(self, valuation_insights: Dict[str, Any],
-                         growth_insights: Dict[str, Any],
-                         risk_insights: Dict[str, Any],
-                         sentiment_insights: Dict[str, Any],
-                         technical_insights: Dict[str, Any]) -> Dict[str, Any]:
+    def _combine_insights(self, valuation_insights: ValuationInsights,
+                         growth_insights: GrowthInsights,
+                         risk_insights: RiskInsights,
+                         sentiment_insights: SentimentInsights,
+                         technical_insights: TechnicalInsights) -> Dict[str, Any]:
         """Combine all insights into a comprehensive view."""
+        valuation_score = self._calculate_valuation_score(valuation_insights)
+        growth_score = self._calculate_growth_score(growth_insights)
+        risk_score = self._calculate_risk_score(risk_insights)
+        sentiment_score = sentiment_insights.sentiment_score
+        technical_score = self._calculate_technical_score(technical_insights)
+        
         combined = {
-            'valuation_score': self._calculate_valuation_score(valuation_insights),
-            'growth_score': self._calculate_growth_score(growth_insights),
-            'risk_score': self._calculate_risk_score(risk_insights),
-            'sentiment_score': sentiment_insights.get('sentiment_score', 0),
-            'technical_score': self._calculate_technical_score(technical_insights),
-            'overall_score': 0.0,
+            'valuation_score': valuation_score,
+            'growth_score': growth_score,
+            'risk_score': risk_score,
+            'sentiment_score': sentiment_score,
+            'technical_score': technical_score,
+            # Calculate overall score (weighted average)
+            'overall_score': score_core(valuation_score, growth_score, risk_score,
+                                        sentiment_score, technical_score),
             'strengths': [],
             'weaknesses': [],
             'neutral_factors': []
         }
         
-        # Calculate overall score (weighted average)
-        scores = [
-            combined['valuation_score'] * 0.25,
-            combined['growth_score'] * 0.25,
-            combined['risk_score'] * 0.20,
-            combined['sentiment_score'] * 0.20,
-            combined['technical_score'] * 0.10
-        ]
-        
-        combined['overall_score'] = sum(scores)
-        
         # Identify strengths and weaknesses
-        if combined['valuation_score'] > 0.6:
+        if valuation_score > 0.6:
             combined['strengths'].append('Attractive valuation')
-        elif combined['valuation_score'] < 0.4:
+        elif valuation_score < 0.4:
             combined['weaknesses'].append('Unattractive valuation')
         
-        if combined['growth_score'] > 0.6:
+        if growth_score > 0.6:
             combined['strengths'].append('Strong growth prospects')
-        elif combined['growth_score'] < 0.4:
+        elif growth_score < 0.4:
             combined['weaknesses'].append('Weak growth prospects')
         
-        if combined['risk_score'] < 0.4:
+        if risk_score < 0.4:
             combined['strengths'].append('Low risk profile')
-        elif combined['risk_score'] > 0.6:
+        elif risk_score > 0.6:
             combined['weaknesses'].append('High risk profile')
         
         return combined
@@ -380,24 +584,10 @@ class InsightGeneratorAgent:
         overall_score = combined_insights.get('overall_score', 0.5)
         
         # Determine recommendation level
-        if overall_score >= 0.7:
-            recommendation = 'buy'
-            confidence = 'high'
-        elif overall_score >= 0.6:
-            recommendation = 'buy'
-            confidence = 'medium'
-        elif overall_score >= 0.4:
-            recommendation = 'hold'
-            confidence = 'medium'
-        elif overall_score >= 0.3:
-            recommendation = 'sell'
-            confidence = 'medium'
-        else:
-            recommendation = 'sell'
-            confidence = 'high'
+        recommendation, confidence = _RECOMMENDATIONS[bisect_right(_RECOMMENDATION_THRESHOLDS, overall_score)]
         
         return {
-            'recommendation': recommendation,
+            'recommendation': recommendation.label,
             'confidence': confidence,
             'score': overall_score,
             'rationale': self._generate_recommendation_rationale(combined_insights),
@@ -410,35 +600,15 @@ class InsightGeneratorAgent:
         # This would be based on data quality, consistency, and coverage
         return 0.75  # Placeholder
     
-    def _identify_key_risks(self, risk_insights: Dict[str, Any]) -> List[str]:
+    def _identify_key_risks(self, risk_insights: RiskInsights) -> List[str]:
         """Identify key risks from risk analysis."""
-        risks = []
-        
-        if risk_insights.get('overall_risk_level') == 'high':
-            risks.append('High overall risk profile')
-        
-        market_risk = risk_insights.get('market_risk', {})
-        if market_risk.get('beta', {}).get('value', 1.0) > 1.5:
-            risks.append('High market volatility (beta > 1.5)')
-        
-        financial_risk = risk_insights.get('financial_risk', {})
-        if financial_risk.get('liquidity', {}).get('risk_level') == 'high':
-            risks.append('Liquidity concerns')
-        
-        return risks
+        return [message for applies, message in _RISK_RULES if applies(risk_insights)]
     
-    def _identify_opportunities(self, growth_insights: Dict[str, Any], 
-                              sentiment_insights: Dict[str, Any]) -> List[str]:
+    def _identify_opportunities(self, growth_insights: GrowthInsights, 
+                              sentiment_insights: SentimentInsights) -> List[str]:
         """Identify investment opportunities."""
-        opportunities = []
-        
-        if growth_insights.get('earnings_growth', {}).get('strength') == 'strong':
-            opportunities.append('Strong earnings growth trajectory')
-        
-        if sentiment_insights.get('overall_sentiment') == 'positive':
-            opportunities.append('Positive market sentiment')
-        
-        return opportunities
+        return [message for applies, message in _OPPORTUNITY_RULES
+                if applies(growth_insights, sentiment_insights)]
     
     def _generate_executive_summary(self, combined_insights: Dict[str, Any], 
                                   recommendation: Dict[str, Any]) -> str:
@@ -446,69 +616,50 @@ class InsightGeneratorAgent:
         score = combined_insights.get('overall_score', 0.5)
         rec = recommendation.get('recommendation', 'hold')
         
-        summary = f"Overall Score: {score:.2f}/1.00\n"
-        summary += f"Recommendation: {rec.upper()}\n"
-        summary += f"Confidence: {recommendation.get('confidence', 'medium').title()}\n\n"
+        lines = [
+            f"Overall Score: {score:.2f}/1.00",
+            f"Recommendation: {rec.upper()}",
+            f"Confidence: {recommendation.get('confidence', 'medium').title()}",
+            ""
+        ]
         
         strengths = combined_insights.get('strengths', [])
         weaknesses = combined_insights.get('weaknesses', [])
         
         if strengths:
-            summary += "Key Strengths:\n"
-            for strength in strengths:
-                summary += f"• {strength}\n"
-            summary += "\n"
+            lines.append("Key Strengths:")
+            lines.extend(f"• {strength}" for strength in strengths)
+            lines.append("")
         
         if weaknesses:
-            summary += "Key Concerns:\n"
-            for weakness in weaknesses:
-                summary += f"• {weakness}\n"
+            lines.append("Key Concerns:")
+            lines.extend(f"• {weakness}" for weakness in weaknesses)
         
-        return summary
+        return "\n".join(lines) + "\n"
     
     # Helper methods for specific calculations
-    def _interpret_pe_ratio(self, pe_ratio: float) -> str:
-        """Interpret P/E ratio values."""
-        if pe_ratio < 10:
-            return 'Potentially undervalued'
-        elif pe_ratio < 20:
-            return 'Fairly valued'
-        elif pe_ratio < 30:
-            return 'Potentially overvalued'
-        else:
-            return 'Significantly overvalued'
-    
-    def _interpret_pb_ratio(self, pb_ratio: float) -> str:
-        """Interpret price-to-book ratio values."""
-        if pb_ratio < 1:
-            return 'Potentially undervalued'
-        elif pb_ratio < 3:
-            return 'Fairly valued'
-        else:
-            return 'Potentially overvalued'
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _interpret_pe_ratio(pe_ratio: float) -> Tuple[int, str]:
+        """Interpret P/E ratio values as a (flag, label) pair."""
+        return interpret_pe_ratio(pe_ratio)
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _interpret_pb_ratio(pb_ratio: float) -> Tuple[int, str]:
+        """Interpret price-to-book ratio values as a (flag, label) pair."""
+        return interpret_pb_ratio(pb_ratio)
     
-    def _assess_growth_strength(self, growth_rate: float) -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _assess_growth_strength(growth_rate: float) -> str:
         """Assess the strength of growth."""
-        if growth_rate > 20:
-            return 'strong'
-        elif growth_rate > 10:
-            return 'moderate'
-        elif growth_rate > 0:
-            return 'weak'
-        else:
-            return 'declining'
+        return assess_growth_strength(growth_rate)
     
-    def _determine_valuation_conclusion(self, valuation_metrics: Dict[str, Any]) -> str:
+    def _determine_valuation_conclusion(self, valuation_metrics: Dict[str, ValuationMetric]) -> str:
         """Determine overall valuation conclusion."""
-        positive_count = 0
-        negative_count = 0
-        
-        for metric in valuation_metrics.values():
-            interpretation = metric.get('interpretation', '')
-            if 'undervalued' in interpretation:
-                positive_count += 1
-            elif 'overvalued' in interpretation:
-                negative_count += 1
+        positive_count = sum(1 for metric in valuation_metrics.values() if metric.flag < VAL_FAIR)
+        negative_count = sum(1 for metric in valuation_metrics.values() if metric.flag > VAL_FAIR)
         
         if positive_count > negative_count:
             return 'attractive'
@@ -517,16 +668,14 @@ class InsightGeneratorAgent:
         else:
             return 'neutral'
     
-    def _determine_overall_risk_level(self, risk_insights: Dict[str, Any]) -> str:
+    def _determine_overall_risk_level(self, risk_insights: RiskInsights) -> str:
         """Determine overall risk level."""
         risk_factors = []
         
-        market_risk = risk_insights.get('market_risk', {})
-        if market_risk.get('beta', {}).get('value', 1.0) > 1.5:
+        if risk_insights.market_risk.beta.value > 1.5:
             risk_factors.append('high_volatility')
         
-        financial_risk = risk_insights.get('financial_risk', {})
-        if financial_risk.get('liquidity', {}).get('risk_level') == 'high':
+        if risk_insights.financial_risk.liquidity.risk_level == 'high':
             risk_factors.append('liquidity_risk')
         
         if len(risk_factors) >= 2:
@@ -536,43 +685,19 @@ class InsightGeneratorAgent:
         else:
             return 'low'
     
-    def _calculate_valuation_score(self, valuation_insights: Dict[str, Any]) -> float:
+    def _calculate_valuation_score(self, valuation_insights: ValuationInsights) -> float:
         """Calculate valuation score (0-1)."""
-        conclusion = valuation_insights.get('valuation_conclusion', 'neutral')
-        
-        if conclusion == 'attractive':
-            return 0.8
-        elif conclusion == 'unattractive':
-            return 0.2
-        else:
-            return 0.5
+        return _VALUATION_SCORES.get(valuation_insights.valuation_conclusion, 0.5)
     
-    def _calculate_growth_score(self, growth_insights: Dict[str, Any]) -> float:
+    def _calculate_growth_score(self, growth_insights: GrowthInsights) -> float:
         """Calculate growth score (0-1)."""
-        earnings_growth = growth_insights.get('earnings_growth', {})
-        strength = earnings_growth.get('strength', 'weak')
-        
-        if strength == 'strong':
-            return 0.8
-        elif strength == 'moderate':
-            return 0.6
-        elif strength == 'weak':
-            return 0.4
-        else:
-            return 0.2
+        return _GROWTH_SCORES.get(growth_insights.earnings_growth.strength, 0.2)
     
-    def _calculate_risk_score(self, risk_insights: Dict[str, Any]) -> float:
+    def _calculate_risk_score(self, risk_insights: RiskInsights) -> float:
         """Calculate risk score (0-1, lower is better)."""
-        risk_level = risk_insights.get('overall_risk_level', 'medium')
-        
-        if risk_level == 'low':
-            return 0.2
-        elif risk_level == 'medium':
-            return 0.5
-        else:
-            return 0.8
+        return _RISK_SCORES.get(risk_insights.overall_risk_level, 0.8)
     
-    def _calculate_technical_score(self, technical_insights: Dict[str, Any]) -> float:
+    def _calculate_technical_score(self, technical_insights: TechnicalInsights) -> float:
         """Calculate technical score (0-1)."""
         # Placeholder implementation
         return 0.5
@@ -594,12 +719,7 @@ class InsightGeneratorAgent:
     
     def _suggest_time_horizon(self, overall_score: float) -> str:
         """Suggest investment time horizon."""
-        if overall_score >= 0.7:
-            return 'Long-term (2+ years)'
-        elif overall_score >= 0.5:
-            return 'Medium-term (6-18 months)'
-        else:
-            return 'Short-term (3-6 months)'
+        return _TIME_HORIZONS[bisect_right(_TIME_HORIZON_THRESHOLDS, overall_score)]
     
     def _suggest_position_size(self, overall_score: float, combined_insights: Dict[str, Any]) -> str:
         """Suggest position size based on score and risk."""
@@ -607,9 +727,4 @@ class InsightGeneratorAgent:
         
         if overall_score >= 0.7 and risk_score < 0.4:
             return 'Large position (5-10% of portfolio)'
-        elif overall_score >= 0.6:
-            return 'Medium position (2-5% of portfolio)'
-        elif overall_score >= 0.4:
-            return 'Small position (1-2% of portfolio)'
-        else:
-            return 'Avoid or minimal position (<1% of portfolio)' 
\ No newline at end of file
+        return _POSITION_SIZES[bisect_right(_POSITION_SIZE_THRESHOLDS, overall_score)] 
\ No newline at end of file
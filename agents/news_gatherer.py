@@ -4,8 +4,19 @@ Collects financial news from multiple sources and filters relevant information.
 """
 
 import os
+import re
+import copy
+import threading
+import asyncio
+import heapq
+import random
 import logging
+from collections import Counter
+from operator import itemgetter
+from cachetools import TTLCache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
@@ -13,6 +24,32 @@ from bs4 import BeautifulSoup
 from newsapi import NewsApiClient
 from config.security import security_manager, rate_limit_decorator, input_validation_decorator
 
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional; fall back to sequential NewsApiClient calls
+    aiohttp = None
+
+NEWSAPI_URL = 'https://newsapi.org/v2/everything'
+NEWSAPI_MAX_ATTEMPTS = 5
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+NEWSAPI_POOL_SIZE = 16
+NEWSAPI_MAX_PAGES = 3  # Stop paging a keyword early once enough relevant articles arrive
+
+# Articles scoring below this are dropped during processing; the best are kept up to the limit
+MIN_RELEVANCE_SCORE = 1.0
+MAX_PROCESSED_ARTICLES = 50
+
+# Titles sharing at least this fraction of their words are treated as duplicates
+DUPLICATE_TITLE_SIMILARITY = 0.8
+TITLE_TOKEN_PATTERN = re.compile(r'\w+')
+
+# Lowercased copies of article text cached during processing, stripped before returning
+LOWERCASE_FIELDS = (('title', '_title_lc'), ('description', '_desc_lc'), ('content', '_content_lc'))
+
+# Gathered news shared across agent instances for a short window
+_news_cache = TTLCache(maxsize=1024, ttl=int(os.getenv('NEWS_CACHE_TTL', 300)))
+_news_cache_lock = threading.Lock()
+
 class NewsGathererAgent:
     """Agent responsible for gathering financial news from various sources."""
     
@@ -23,33 +60,58 @@ class NewsGathererAgent:
         # Initialize News API client
         self.news_api_key = os.getenv('NEWS_API_KEY')
         if self.news_api_key and security_manager.validate_api_key(self.news_api_key, 'news'):
-            self.news_client = NewsApiClient(api_key=self.news_api_key)
+            self.news_client = NewsApiClient(api_key=self.news_api_key, session=self._create_session())
         else:
             self.news_client = None
             self.logger.warning("News API key not configured or invalid")
         
         # Define financial news sources
-        self.financial_sources = [
+        self.financial_sources = frozenset({
             'reuters', 'bloomberg', 'cnbc', 'marketwatch', 
             'yahoo-finance', 'seeking-alpha', 'investing.com'
-        ]
+        })
         
-        # Keywords for financial news filtering
-        self.financial_keywords = [
+        # Keywords for financial news filtering; the tuple keeps search order and the
+        # lowercased frozenset serves the membership tests in relevance scoring
+        self.financial_keywords = (
             'earnings', 'revenue', 'profit', 'loss', 'stock', 'market',
             'trading', 'investment', 'finance', 'economy', 'GDP',
             'inflation', 'interest rates', 'Federal Reserve', 'SEC'
-        ]
+        )
+        self.financial_keyword_set = frozenset(keyword.lower() for keyword in self.financial_keywords)
+        # One word-bounded alternation finds every financial keyword in a single pass
+        # (longest first, so "interest rates" wins over any shorter overlapping keyword)
+        self.financial_keyword_pattern = re.compile(r'\b(?:' + '|'.join(
+            re.escape(keyword) for keyword in sorted(self.financial_keyword_set, key=len, reverse=True)
+        ) + r')\b')
         
         # Rate limiting configuration
         self.request_delay = 1  # seconds between requests
         self.max_articles_per_source = 10
+        self.max_concurrent_requests = int(os.getenv('NEWS_CONCURRENCY', 8))
         
+    def _create_session(self) -> requests.Session:
+        """Pooled HTTP session so repeated News API calls reuse TCP/TLS connections."""
+        session = requests.Session()
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=sorted(RETRYABLE_STATUSES),
+            raise_on_status=False  # Let NewsApiClient surface the final error response
+        )
+        session.mount('https://', HTTPAdapter(
+            pool_connections=NEWSAPI_POOL_SIZE,
+            pool_maxsize=NEWSAPI_POOL_SIZE,
+            max_retries=retry
+        ))
+        return session
+    
     @rate_limit_decorator
     @input_validation_decorator
     def gather_financial_news(self, ticker_symbol: str = None, 
                             keywords: List[str] = None, 
-                            days_back: int = 7) -> Dict[str, Any]:
+                            days_back: int = 7,
+                            force_refresh: bool = False) -> Dict[str, Any]:
         """
         Gather financial news from multiple sources.
         
@@ -57,6 +119,7 @@ class NewsGathererAgent:
             ticker_symbol: Stock ticker symbol to search for
             keywords: Additional keywords to search for
             days_back: Number of days to look back for news
+            force_refresh: Bypass the cache of recently gathered news
             
         Returns:
             Dict containing gathered news articles and metadata
@@ -68,8 +131,17 @@ class NewsGathererAgent:
             if ticker_symbol and not security_manager.validate_ticker_symbol(ticker_symbol):
                 raise ValueError(f"Invalid ticker symbol: {ticker_symbol}")
             
-            # Combine keywords
-            search_keywords = keywords or []
+            # Serve repeated requests within the cache window from memory
+            cache_key = (ticker_symbol, tuple(sorted(keywords or [])), days_back)
+            if not force_refresh:
+                with _news_cache_lock:
+                    cached = _news_cache.get(cache_key)
+                if cached is not None:
+                    self.logger.info(f"Returning cached news for ticker: {ticker_symbol}")
+                    return copy.deepcopy(cached)
+            
+            # Combine keywords (copied so the caller's list is not modified)
+            search_keywords = list(keywords or [])
             if ticker_symbol:
                 search_keywords.append(ticker_symbol)
             search_keywords.extend(self.financial_keywords)
@@ -97,11 +169,17 @@ class NewsGathererAgent:
             
             # Process and filter articles
             processed_articles = self._process_articles(news_data['articles'])
+            for article in processed_articles:
+                for _, cached_field in LOWERCASE_FIELDS:
+                    article.pop(cached_field, None)
             news_data['articles'] = processed_articles
             
             # Generate summary
             news_data['summary'] = self._generate_news_summary(processed_articles)
             
+            with _news_cache_lock:
+                _news_cache[cache_key] = copy.deepcopy(news_data)
+            
             self.logger.info(f"Successfully gathered {len(processed_articles)} articles")
             return news_data
             
@@ -115,36 +193,46 @@ class NewsGathererAgent:
     
     def _gather_from_news_api(self, keywords: List[str], days_back: int) -> List[Dict]:
         """Gather news from News API."""
+        # Fan the keyword queries out concurrently unless already inside an event loop
+        if aiohttp is not None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self._gather_from_news_api_async(keywords, days_back))
+        
         articles = []
         
         try:
             # Calculate date range
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days_back)
+            page_size = min(self.max_articles_per_source, 20)
             
             # Search for each keyword
             for keyword in keywords[:5]:  # Limit to 5 keywords to avoid rate limits
                 try:
-                    response = self.news_client.get_everything(
-                        q=keyword,
-                        from_param=start_date.strftime('%Y-%m-%d'),
-                        to=end_date.strftime('%Y-%m-%d'),
-                        language='en',
-                        sort_by='relevancy',
-                        page_size=min(self.max_articles_per_source, 20)
-                    )
-                    
-                    for article in response.get('articles', []):
-                        articles.append({
-                            'title': article.get('title', ''),
-                            'description': article.get('description', ''),
-                            'content': article.get('content', ''),
-                            'url': article.get('url', ''),
-                            'source': article.get('source', {}).get('name', ''),
-                            'published_at': article.get('publishedAt', ''),
-                            'keyword_matched': keyword,
-                            'relevance_score': self._calculate_relevance_score(article, keyword)
-                        })
+                    qualified = 0
+                    for page in range(1, NEWSAPI_MAX_PAGES + 1):
+                        try:
+                            response = self.news_client.get_everything(
+                                q=keyword,
+                                from_param=start_date.strftime('%Y-%m-%d'),
+                                to=end_date.strftime('%Y-%m-%d'),
+                                language='en',
+                                sort_by='relevancy',
+                                page_size=page_size,
+                                page=page
+                            )
+                        except Exception as e:
+                            if page == 1:
+                                raise
+                            self.logger.warning(f"Error fetching page {page} of news for keyword '{keyword}': {str(e)}")
+                            break
+                        
+                        page_articles = response.get('articles', [])
+                        qualified += self._add_page_articles(articles, page_articles, keyword)
+                        if qualified >= self.max_articles_per_source or len(page_articles) < page_size:
+                            break
                         
                 except Exception as e:
                     self.logger.warning(f"Error fetching news for keyword '{keyword}': {str(e)}")
@@ -155,65 +243,207 @@ class NewsGathererAgent:
         
         return articles
     
+    async def _gather_from_news_api_async(self, keywords: List[str], days_back: int) -> List[Dict]:
+        """Gather news from News API, querying all keywords concurrently."""
+        articles = []
+        
+        # Calculate date range
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days_back)
+        search_keywords = keywords[:5]  # Limit to 5 keywords to avoid rate limits
+        params = {
+            'from': start_date.strftime('%Y-%m-%d'),
+            'to': end_date.strftime('%Y-%m-%d'),
+            'language': 'en',
+            'sortBy': 'relevancy',
+            'pageSize': min(self.max_articles_per_source, 20)
+        }
+        
+        # Created per call: asyncio primitives bind to the loop that first uses them
+        semaphore = asyncio.BoundedSemaphore(self.max_concurrent_requests)
+        
+        connector = aiohttp.TCPConnector(limit_per_host=10)
+        async with aiohttp.ClientSession(connector=connector,
+                                         headers={'X-Api-Key': self.news_api_key}) as session:
+            responses = await asyncio.gather(*(
+                self._fetch_keyword_articles(session, semaphore, keyword, params)
+                for keyword in search_keywords
+            ), return_exceptions=True)
+        
+        for keyword, response in zip(search_keywords, responses):
+            if isinstance(response, Exception):
+                self.logger.warning(f"Error fetching news for keyword '{keyword}': {str(response)}")
+                continue
+            
+            articles.extend(response)
+        
+        return articles
+    
+    async def _fetch_keyword_articles(self, session, semaphore: asyncio.BoundedSemaphore,
+                                      keyword: str, params: Dict[str, Any]) -> List[Dict]:
+        """Page through News API results for one keyword until enough relevant articles arrive."""
+        articles = []
+        qualified = 0
+        
+        for page in range(1, NEWSAPI_MAX_PAGES + 1):
+            try:
+                response = await self._fetch_news_api(session, semaphore, {**params, 'q': keyword, 'page': page})
+            except Exception as e:
+                if page == 1:
+                    raise
+                self.logger.warning(f"Error fetching page {page} of news for keyword '{keyword}': {str(e)}")
+                break
+            
+            page_articles = response.get('articles', [])
+            qualified += self._add_page_articles(articles, page_articles, keyword)
+            if qualified >= self.max_articles_per_source or len(page_articles) < params['pageSize']:
+                break
+        
+        return articles
+    
+    def _add_page_articles(self, articles: List[Dict], page_articles: List[Dict], keyword: str) -> int:
+        """Format one page of raw articles into articles; returns how many are relevant enough to keep."""
+        qualified = 0
+        for article in page_articles:
+            formatted = self._format_article(article, keyword)
+            articles.append(formatted)
+            if formatted['relevance_score'] >= MIN_RELEVANCE_SCORE:
+                qualified += 1
+        return qualified
+    
+    async def _fetch_news_api(self, session, semaphore: asyncio.BoundedSemaphore,
+                              params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch one page of News API results, retrying rate limits and server errors with backoff."""
+        for attempt in range(NEWSAPI_MAX_ATTEMPTS):
+            retry_after = None
+            try:
+                async with semaphore:
+                    async with session.get(NEWSAPI_URL, params=params) as response:
+                        if response.status not in RETRYABLE_STATUSES:
+                            # Accept any content type: a non-JSON error page is a permanent failure,
+                            # and ContentTypeError would be retried as a ClientError
+                            try:
+                                payload = await response.json(content_type=None)
+                            except ValueError:
+                                raise RuntimeError(f"HTTP {response.status}: response is not JSON") from None
+                            if response.status != 200 or payload.get('status') == 'error':
+                                raise RuntimeError(payload.get('message', f"HTTP {response.status}"))
+                            return payload
+                        
+                        retry_after = response.headers.get('Retry-After')
+                        error = RuntimeError(f"HTTP {response.status}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+            
+            if attempt == NEWSAPI_MAX_ATTEMPTS - 1:
+                break
+            
+            # Honour Retry-After when given, otherwise exponential backoff with jitter
+            if retry_after and retry_after.isdigit():
+                delay = float(retry_after)
+            else:
+                delay = min(2 ** attempt, 30) + random.random()
+            self.logger.warning(f"News API request for '{params.get('q')}' failed ({error}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        
+        raise error
+    
+    def _format_article(self, article: Dict, keyword: str) -> Dict[str, Any]:
+        """Normalize a raw News API article and score its relevance."""
+        formatted = {
+            'title': article.get('title', ''),
+            'description': article.get('description', ''),
+            'content': article.get('content', ''),
+            'url': article.get('url', ''),
+            'source': article.get('source', {}).get('name', ''),
+            'published_at': article.get('publishedAt', ''),
+            'keyword_matched': keyword
+        }
+        
+        # Lowercase each text field once for scoring and deduplication
+        for source_field, cached_field in LOWERCASE_FIELDS:
+            formatted[cached_field] = (formatted[source_field] or '').lower()
+        
+        formatted['relevance_score'] = self._calculate_relevance_score(formatted, keyword)
+        return formatted
+    
     def _gather_from_additional_sources(self, keywords: List[str], days_back: int) -> List[Dict]:
         """Gather news from additional sources (placeholder for future implementation)."""
         # This method can be extended to gather from other sources
-        # like RSS feeds, web scraping, etc.
+        # like RSS feeds, web scraping, etc., fanning out with asyncio.gather
+        # the same way as _gather_from_news_api_async
         return []
     
     def _calculate_relevance_score(self, article: Dict, keyword: str) -> float:
         """Calculate relevance score for an article based on keyword matching."""
         score = 0.0
-        title = article.get('title', '').lower()
-        description = article.get('description', '').lower()
-        content = article.get('content', '').lower()
+        keyword = keyword.lower()
+        
+        title, description, content = (
+            article[cached_field] if cached_field in article else (article.get(source_field) or '').lower()
+            for source_field, cached_field in LOWERCASE_FIELDS
+        )
         
         # Keyword in title gets highest score
-        if keyword.lower() in title:
+        if keyword in title:
             score += 3.0
         
         # Keyword in description gets medium score
-        if keyword.lower() in description:
+        if keyword in description:
             score += 2.0
         
         # Keyword in content gets lower score
-        if keyword.lower() in content:
+        if keyword in content:
             score += 1.0
         
-        # Financial keywords boost score
-        for fin_keyword in self.financial_keywords:
-            if fin_keyword.lower() in title or fin_keyword.lower() in description:
-                score += 0.5
+        # Financial keywords boost score, counting each whole-word keyword once
+        financial_hits = set(self.financial_keyword_pattern.findall(title))
+        financial_hits.update(self.financial_keyword_pattern.findall(description))
+        score += 0.5 * len(financial_hits)
         
         return min(score, 5.0)  # Cap at 5.0
     
     def _process_articles(self, articles: List[Dict]) -> List[Dict]:
         """Process and filter articles for relevance and quality."""
         processed = []
+        kept_titles = []  # Token set of each kept article's title
+        title_index = {}  # Title token -> indexes into kept_titles
         
         for article in articles:
             # Filter out articles with low relevance
-            if article.get('relevance_score', 0) < 1.0:
+            if article.get('relevance_score', 0) < MIN_RELEVANCE_SCORE:
                 continue
             
             # Remove duplicate articles based on title similarity
-            if not self._is_duplicate(article, processed):
-                processed.append(article)
-        
-        # Sort by relevance score
-        processed.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
+            title = article['_title_lc'] if '_title_lc' in article else (article.get('title') or '').lower()
+            tokens = frozenset(TITLE_TOKEN_PATTERN.findall(title))
+            if self._is_duplicate(tokens, kept_titles, title_index):
+                continue
+            
+            for token in tokens:
+                title_index.setdefault(token, []).append(len(kept_titles))
+            kept_titles.append(tokens)
+            processed.append(article)
         
-        return processed[:50]  # Limit to top 50 articles
+        # Keep the top articles by relevance score without sorting the whole list
+        return heapq.nlargest(MAX_PROCESSED_ARTICLES, processed, key=itemgetter('relevance_score'))
     
-    def _is_duplicate(self, article: Dict, existing_articles: List[Dict]) -> bool:
-        """Check if article is a duplicate based on title similarity."""
-        title = article.get('title', '').lower()
+    def _is_duplicate(self, tokens: frozenset, kept_titles: List[frozenset],
+                      title_index: Dict[str, List[int]]) -> bool:
+        """Check if a title duplicates a kept one: one contains the other's words, or Jaccard >= 0.8."""
+        if not tokens:
+            return bool(kept_titles)
         
-        for existing in existing_articles:
-            existing_title = existing.get('title', '').lower()
-            
-            # Simple similarity check (can be improved with more sophisticated algorithms)
-            if title == existing_title or title in existing_title or existing_title in title:
+        # Only titles sharing a word can match, so look candidates up in the inverted index
+        candidates = set()
+        for token in tokens:
+            candidates.update(title_index.get(token, ()))
+        
+        for index in candidates:
+            existing = kept_titles[index]
+            if tokens <= existing or existing <= tokens:
+                return True
+            if len(tokens & existing) >= DUPLICATE_TITLE_SIMILARITY * len(tokens | existing):
                 return True
         
         return False
@@ -228,60 +458,71 @@ class NewsGathererAgent:
                 'sentiment_overview': 'neutral'
             }
         
-        # Count sources
-        source_counts = {}
-        keyword_counts = {}
+        # Accumulate every statistic in a single pass over the articles
+        source_counts = Counter()
+        keyword_counts = Counter()
+        relevance_total = 0.0
+        earliest = latest = None
         
         for article in articles:
-            source = article.get('source', 'Unknown')
-            source_counts[source] = source_counts.get(source, 0) + 1
+            source_counts[article.get('source', 'Unknown')] += 1
             
-            keyword = article.get('keyword_matched', '')
+            keyword = article.get('keyword_matched')
             if keyword:
-                keyword_counts[keyword] = keyword_counts.get(keyword, 0) + 1
-        
-        # Get top sources and keywords
-        top_sources = sorted(source_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-        top_keywords = sorted(keyword_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+                keyword_counts[keyword] += 1
+            
+            relevance_total += article.get('relevance_score', 0)
+            
+            published_at = article.get('published_at')
+            if published_at:
+                if earliest is None or published_at < earliest:
+                    earliest = published_at
+                if latest is None or published_at > latest:
+                    latest = published_at
         
         return {
             'total_articles': len(articles),
-            'top_sources': top_sources,
-            'top_keywords': top_keywords,
-            'average_relevance_score': sum(a.get('relevance_score', 0) for a in articles) / len(articles),
+            'top_sources': source_counts.most_common(5),
+            'top_keywords': keyword_counts.most_common(5),
+            'average_relevance_score': relevance_total / len(articles),
             'date_range': {
-                'earliest': min(a.get('published_at', '') for a in articles if a.get('published_at')),
-                'latest': max(a.get('published_at', '') for a in articles if a.get('published_at'))
+                'earliest': earliest or '',
+                'latest': latest or ''
             }
         }
     
-    def get_news_for_ticker(self, ticker_symbol: str, days_back: int = 7) -> Dict[str, Any]:
+    def get_news_for_ticker(self, ticker_symbol: str, days_back: int = 7,
+                            force_refresh: bool = False) -> Dict[str, Any]:
         """
         Get news specifically for a ticker symbol.
         
         Args:
             ticker_symbol: Stock ticker symbol
             days_back: Number of days to look back
+            force_refresh: Bypass the cache of recently gathered news
             
         Returns:
             Dict containing ticker-specific news
         """
         return self.gather_financial_news(
             ticker_symbol=ticker_symbol,
-            days_back=days_back
+            days_back=days_back,
+            force_refresh=force_refresh
         )
     
-    def get_market_overview(self, days_back: int = 7) -> Dict[str, Any]:
+    def get_market_overview(self, days_back: int = 7, force_refresh: bool = False) -> Dict[str, Any]:
         """
         Get general market overview news.
         
         Args:
             days_back: Number of days to look back
+            force_refresh: Bypass the cache of recently gathered news
             
         Returns:
             Dict containing market overview news
         """
         return self.gather_financial_news(
             keywords=['market', 'economy', 'trading', 'investing'],
-            days_back=days_back
+            days_back=days_back,
+            force_refresh=force_refresh
         ) 
\ No newline at end of file
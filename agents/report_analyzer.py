@@ -6,11 +6,76 @@ Analyzes financial reports, earnings calls, and regulatory filings to extract ke
 import os
 import logging
 import json
+import operator
+import threading
+import numpy as np
+import pandas as pd
 import yfinance as yf
-from datetime import datetime, timedelta
+from cachetools import LRUCache
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from datetime import date, datetime, timedelta
 from typing import List, Dict, Any, Optional
 from config.security import security_manager, rate_limit_decorator, input_validation_decorator
 
+@lru_cache(maxsize=256)
+def _cached_ticker(ticker_symbol: str, day: str) -> yf.Ticker:
+    """Shared yf.Ticker per symbol and day; yfinance memoizes info and statements on it."""
+    return yf.Ticker(ticker_symbol)
+
+# Price histories by (symbol, day, period). yfinance returns an empty frame instead of
+# raising when a fetch fails or is throttled, so only non-empty frames are kept.
+_history_cache = LRUCache(maxsize=256)
+_history_cache_lock = threading.Lock()
+
+def _cached_history(ticker_symbol: str, day: str, period: str):
+    """Price history per symbol, day and period; empty results are fetched again on the next call."""
+    key = (ticker_symbol, day, period)
+    with _history_cache_lock:
+        hist = _history_cache.get(key)
+    if hist is None:
+        hist = _cached_ticker(ticker_symbol, day).history(period=period)
+        if not hist.empty:
+            with _history_cache_lock:
+                _history_cache[key] = hist
+    return hist
+
+def _today() -> str:
+    """Cache key that refreshes yfinance data daily."""
+    return date.today().isoformat()
+
+# Insight templates: (type, category, message, severity), the message formatted with the metric
+_HIGH_PE = ('valuation', 'high_pe', 'High P/E ratio of {:.2f} suggests premium valuation', 'warning')
+_LOW_PE = ('valuation', 'low_pe', 'Low P/E ratio of {:.2f} suggests potential undervaluation', 'positive')
+_STRONG_GROWTH = ('earnings', 'strong_growth', 'Strong earnings growth of {:.1f}%', 'positive')
+_DECLINING_EARNINGS = ('earnings', 'declining_earnings', 'Declining earnings growth of {:.1f}%', 'negative')
+_LIQUIDITY_CONCERN = ('financial_health', 'liquidity_concern',
+                      'Low current ratio of {:.2f} indicates potential liquidity issues', 'warning')
+_STRONG_LIQUIDITY = ('financial_health', 'strong_liquidity',
+                     'Strong current ratio of {:.2f} indicates good liquidity', 'positive')
+_SECTOR_INFO = ('sector', 'sector_info', 'Company operates in {} sector', 'info')
+
+# Threshold rules in reporting order: (metric, comparison, threshold, template).
+# The comparisons work on scalars and on NumPy columns alike; a NaN metric never matches.
+_INSIGHT_RULES = (
+    ('pe', operator.gt, 25, _HIGH_PE),
+    ('pe', operator.lt, 10, _LOW_PE),
+    ('avg_growth', operator.gt, 20, _STRONG_GROWTH),
+    ('avg_growth', operator.lt, -10, _DECLINING_EARNINGS),
+    ('current_ratio', operator.lt, 1, _LIQUIDITY_CONCERN),
+    ('current_ratio', operator.gt, 2, _STRONG_LIQUIDITY)
+)
+
+def _insight(template: tuple, value: Any) -> Dict[str, Any]:
+    """Build an insight record from a template and the metric value it reports."""
+    insight_type, category, message, severity = template
+    return {
+        'type': insight_type,
+        'category': category,
+        'message': message.format(value),
+        'severity': severity
+    }
+
 class ReportAnalyzerAgent:
     """Agent responsible for analyzing financial reports and extracting insights."""
     
@@ -18,29 +83,32 @@ class ReportAnalyzerAgent:
         """Initialize the report analyzer agent."""
         self.logger = logging.getLogger(__name__)
         
-        # Define report types to analyze
-        self.report_types = [
+        # Define report types to analyze (frozensets: only used for membership tests)
+        self.report_types = frozenset({
             'earnings', 'quarterly', 'annual', '10-k', '10-q', 
             '8-k', 'proxy', 'prospectus'
-        ]
+        })
         
         # Key financial metrics to extract
-        self.key_metrics = [
+        self.key_metrics = frozenset({
             'revenue', 'net_income', 'earnings_per_share', 'cash_flow',
             'debt', 'assets', 'liabilities', 'equity', 'margins',
             'growth_rate', 'return_on_equity', 'return_on_assets'
-        ]
+        })
         
         # Sentiment keywords for analysis
-        self.positive_keywords = [
+        self.positive_keywords = frozenset({
             'growth', 'increase', 'improve', 'strong', 'positive',
             'profit', 'gain', 'upside', 'opportunity', 'expansion'
-        ]
+        })
         
-        self.negative_keywords = [
+        self.negative_keywords = frozenset({
             'decline', 'decrease', 'loss', 'weak', 'negative',
             'risk', 'concern', 'challenge', 'downturn', 'reduction'
-        ]
+        })
+        
+        # Concurrent yfinance lookups when analyzing several companies
+        self.max_concurrent_companies = int(os.getenv('YFINANCE_CONCURRENCY', 8))
     
     @rate_limit_decorator
     @input_validation_decorator
@@ -59,56 +127,70 @@ class ReportAnalyzerAgent:
             Dict containing analysis results and insights
         """
         try:
-            self.logger.info(f"Starting report analysis for {ticker_symbol}")
-            
-            # Validate ticker symbol
-            if not security_manager.validate_ticker_symbol(ticker_symbol):
-                raise ValueError(f"Invalid ticker symbol: {ticker_symbol}")
-            
-            # Get company information
-            company_info = self._get_company_info(ticker_symbol)
-            
-            # Get financial data
-            financial_data = self._get_financial_data(ticker_symbol, period)
-            
-            # Analyze earnings reports
-            earnings_analysis = self._analyze_earnings_reports(ticker_symbol, period)
-            
-            # Analyze balance sheet and income statement
-            financial_analysis = self._analyze_financial_statements(financial_data)
+            company_data = self._collect_company_data(ticker_symbol, period)
             
             # Generate insights
-            insights = self._generate_insights(
-                company_info, financial_data, earnings_analysis, financial_analysis
-            )
+            insights = self._generate_insights(*company_data)
             
-            analysis_result = {
-                'ticker_symbol': ticker_symbol,
-                'analysis_date': datetime.now().isoformat(),
-                'period_analyzed': period,
-                'company_info': company_info,
-                'financial_data': financial_data,
-                'earnings_analysis': earnings_analysis,
-                'financial_analysis': financial_analysis,
-                'insights': insights,
-                'summary': self._generate_analysis_summary(insights)
-            }
+            analysis_result = self._build_analysis_result(ticker_symbol, period, company_data, insights)
             
             self.logger.info(f"Successfully analyzed reports for {ticker_symbol}")
             return analysis_result
             
         except Exception as e:
-            self.logger.error(f"Error analyzing reports for {ticker_symbol}: {str(e)}")
-            security_manager.log_security_event("report_analysis_error", {
-                'error': str(e),
-                'ticker': ticker_symbol
-            })
+            self._log_analysis_error(ticker_symbol, e)
             raise
     
+    def _collect_company_data(self, ticker_symbol: str, period: str) -> tuple:
+        """Fetch and analyze the raw data for one company, ready for insight generation."""
+        self.logger.info(f"Starting report analysis for {ticker_symbol}")
+        
+        # Validate ticker symbol
+        if not security_manager.validate_ticker_symbol(ticker_symbol):
+            raise ValueError(f"Invalid ticker symbol: {ticker_symbol}")
+        
+        # Get company information
+        company_info = self._get_company_info(ticker_symbol)
+        
+        # Get financial data
+        financial_data = self._get_financial_data(ticker_symbol, period)
+        
+        # Analyze earnings reports
+        earnings_analysis = self._analyze_earnings_reports(ticker_symbol, period)
+        
+        # Analyze balance sheet and income statement
+        financial_analysis = self._analyze_financial_statements(financial_data)
+        
+        return company_info, financial_data, earnings_analysis, financial_analysis
+    
+    def _build_analysis_result(self, ticker_symbol: str, period: str, company_data: tuple,
+                               insights: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Assemble the analysis result for one company."""
+        company_info, financial_data, earnings_analysis, financial_analysis = company_data
+        return {
+            'ticker_symbol': ticker_symbol,
+            'analysis_date': datetime.now().isoformat(),
+            'period_analyzed': period,
+            'company_info': company_info,
+            'financial_data': self._serialize_financial_data(financial_data),
+            'earnings_analysis': earnings_analysis,
+            'financial_analysis': financial_analysis,
+            'insights': insights,
+            'summary': self._generate_analysis_summary(insights)
+        }
+    
+    def _log_analysis_error(self, ticker_symbol: str, error: Exception):
+        """Log a failed company analysis and record it as a security event."""
+        self.logger.error(f"Error analyzing reports for {ticker_symbol}: {str(error)}")
+        security_manager.log_security_event("report_analysis_error", {
+            'error': str(error),
+            'ticker': ticker_symbol
+        })
+    
     def _get_company_info(self, ticker_symbol: str) -> Dict[str, Any]:
         """Get basic company information."""
         try:
-            ticker = yf.Ticker(ticker_symbol)
+            ticker = _cached_ticker(ticker_symbol, _today())
             info = ticker.info
             
             return {
@@ -130,9 +212,10 @@ class ReportAnalyzerAgent:
             return {}
     
     def _get_financial_data(self, ticker_symbol: str, period: str) -> Dict[str, Any]:
-        """Get financial data for analysis."""
+        """Get financial data for analysis as pandas objects."""
         try:
-            ticker = yf.Ticker(ticker_symbol)
+            day = _today()
+            ticker = _cached_ticker(ticker_symbol, day)
             
             # Get financial statements
             balance_sheet = ticker.balance_sheet
@@ -140,23 +223,35 @@ class ReportAnalyzerAgent:
             cash_flow = ticker.cashflow
             
             # Get historical price data
-            hist = ticker.history(period=period)
+            hist = _cached_history(ticker_symbol, day, period)
             
             return {
-                'balance_sheet': balance_sheet.to_dict() if balance_sheet is not None else {},
-                'income_statement': income_stmt.to_dict() if income_stmt is not None else {},
-                'cash_flow': cash_flow.to_dict() if cash_flow is not None else {},
-                'price_history': hist.to_dict() if hist is not None else {},
+                'balance_sheet': balance_sheet,
+                'income_statement': income_stmt,
+                'cash_flow': cash_flow,
+                'price_history': hist,
                 'period': period
             }
         except Exception as e:
             self.logger.warning(f"Error getting financial data for {ticker_symbol}: {str(e)}")
             return {}
     
+    def _serialize_financial_data(self, financial_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert the financial DataFrames to dicts for the analysis result."""
+        if not financial_data:
+            return {}
+        
+        serialized = {
+            key: frame.to_dict() if frame is not None else {}
+            for key, frame in financial_data.items() if key != 'period'
+        }
+        serialized['period'] = financial_data.get('period')
+        return serialized
+    
     def _analyze_earnings_reports(self, ticker_symbol: str, period: str) -> Dict[str, Any]:
         """Analyze earnings reports and call transcripts."""
         try:
-            ticker = yf.Ticker(ticker_symbol)
+            ticker = _cached_ticker(ticker_symbol, _today())
             
             # Get earnings dates
             earnings_dates = ticker.earnings_dates
@@ -172,17 +267,15 @@ class ReportAnalyzerAgent:
             # Analyze earnings trends
             if earnings_dates is not None and not earnings_dates.empty:
                 # Calculate earnings growth
-                eps_values = earnings_dates['Earnings'].dropna()
+                eps_values = earnings_dates['Earnings'].dropna().to_numpy(dtype=np.float64)
                 if len(eps_values) > 1:
-                    growth_rates = []
-                    for i in range(1, len(eps_values)):
-                        if eps_values.iloc[i-1] != 0:
-                            growth = ((eps_values.iloc[i] - eps_values.iloc[i-1]) / 
-                                    abs(eps_values.iloc[i-1])) * 100
-                            growth_rates.append(growth)
+                    # Period-over-period change, skipping periods that follow a zero EPS
+                    previous = eps_values[:-1]
+                    nonzero = previous != 0
+                    growth_rates = (np.diff(eps_values)[nonzero] / np.abs(previous[nonzero])) * 100
                     
-                    analysis['earnings_growth'] = growth_rates
-                    analysis['avg_earnings_growth'] = sum(growth_rates) / len(growth_rates) if growth_rates else 0
+                    analysis['earnings_growth'] = growth_rates.tolist()
+                    analysis['avg_earnings_growth'] = float(growth_rates.mean()) if growth_rates.size else 0
             
             return analysis
             
@@ -201,15 +294,15 @@ class ReportAnalyzerAgent:
         }
         
         try:
-            balance_sheet = financial_data.get('balance_sheet', {})
-            income_stmt = financial_data.get('income_statement', {})
-            cash_flow = financial_data.get('cash_flow', {})
+            balance_sheet = financial_data.get('balance_sheet')
+            income_stmt = financial_data.get('income_statement')
             
             # Calculate key ratios if data is available
-            if balance_sheet and income_stmt:
-                # Get most recent data
-                latest_balance = list(balance_sheet.values())[0] if balance_sheet else {}
-                latest_income = list(income_stmt.values())[0] if income_stmt else {}
+            if (balance_sheet is not None and not balance_sheet.empty
+                    and income_stmt is not None and not income_stmt.empty):
+                # Get most recent data (first column, indexed by line item)
+                latest_balance = balance_sheet.iloc[:, 0]
+                latest_income = income_stmt.iloc[:, 0]
                 
                 # Profitability metrics
                 if 'Total Revenue' in latest_income and 'Net Income' in latest_income:
@@ -245,73 +338,66 @@ class ReportAnalyzerAgent:
         insights = []
         
         try:
-            # Valuation insights
-            if company_info.get('pe_ratio'):
-                pe_ratio = company_info['pe_ratio']
-                if pe_ratio > 25:
-                    insights.append({
-                        'type': 'valuation',
-                        'category': 'high_pe',
-                        'message': f'High P/E ratio of {pe_ratio:.2f} suggests premium valuation',
-                        'severity': 'warning'
-                    })
-                elif pe_ratio < 10:
-                    insights.append({
-                        'type': 'valuation',
-                        'category': 'low_pe',
-                        'message': f'Low P/E ratio of {pe_ratio:.2f} suggests potential undervaluation',
-                        'severity': 'positive'
-                    })
+            metrics = self._insight_metrics(company_info, earnings_analysis, financial_analysis)
             
-            # Earnings growth insights
-            avg_growth = earnings_analysis.get('avg_earnings_growth', 0)
-            if avg_growth > 20:
-                insights.append({
-                    'type': 'earnings',
-                    'category': 'strong_growth',
-                    'message': f'Strong earnings growth of {avg_growth:.1f}%',
-                    'severity': 'positive'
-                })
-            elif avg_growth < -10:
-                insights.append({
-                    'type': 'earnings',
-                    'category': 'declining_earnings',
-                    'message': f'Declining earnings growth of {avg_growth:.1f}%',
-                    'severity': 'negative'
-                })
-            
-            # Financial health insights
-            current_ratio = financial_analysis.get('liquidity_metrics', {}).get('current_ratio', 0)
-            if current_ratio < 1:
-                insights.append({
-                    'type': 'financial_health',
-                    'category': 'liquidity_concern',
-                    'message': f'Low current ratio of {current_ratio:.2f} indicates potential liquidity issues',
-                    'severity': 'warning'
-                })
-            elif current_ratio > 2:
-                insights.append({
-                    'type': 'financial_health',
-                    'category': 'strong_liquidity',
-                    'message': f'Strong current ratio of {current_ratio:.2f} indicates good liquidity',
-                    'severity': 'positive'
-                })
+            # Valuation, earnings growth and financial health insights
+            for metric, compare, threshold, template in _INSIGHT_RULES:
+                value = metrics[metric]
+                if compare(value, threshold):
+                    insights.append(_insight(template, value))
             
             # Sector comparison insights
-            sector = company_info.get('sector', '')
+            sector = metrics['sector']
             if sector and sector != 'Unknown':
-                insights.append({
-                    'type': 'sector',
-                    'category': 'sector_info',
-                    'message': f'Company operates in {sector} sector',
-                    'severity': 'info'
-                })
+                insights.append(_insight(_SECTOR_INFO, sector))
             
         except Exception as e:
             self.logger.warning(f"Error generating insights: {str(e)}")
         
         return insights
     
+    def _insight_metrics(self, company_info: Dict[str, Any],
+                         earnings_analysis: Dict[str, Any],
+                         financial_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the metrics insights are generated from; a missing P/E ratio becomes NaN."""
+        return {
+            'pe': company_info.get('pe_ratio') or np.nan,
+            'avg_growth': earnings_analysis.get('avg_earnings_growth', 0),
+            'current_ratio': financial_analysis.get('liquidity_metrics', {}).get('current_ratio', 0),
+            'sector': company_info.get('sector', '')
+        }
+    
+    def _batch_insights(self, frame: pd.DataFrame) -> List[List[Dict[str, Any]]]:
+        """
+        Generate insights for many companies at once.
+        
+        Args:
+            frame: One row per company with pe, avg_growth, current_ratio and sector columns
+        
+        Returns:
+            List of insight lists aligned with the rows of the frame
+        """
+        insights = [[] for _ in range(len(frame))]
+        columns = {
+            metric: frame[metric].to_numpy(dtype=np.float64)
+            for metric in ('pe', 'avg_growth', 'current_ratio')
+        }
+        
+        # Threshold each metric column once and build records only for the matching rows
+        for metric, compare, threshold, template in _INSIGHT_RULES:
+            values = columns[metric]
+            with np.errstate(invalid='ignore'):
+                matches = np.flatnonzero(compare(values, threshold))
+            for row in matches:
+                insights[row].append(_insight(template, values[row]))
+        
+        # pandas stores a missing sector as NaN, which is truthy
+        for row, sector in enumerate(frame['sector']):
+            if pd.notna(sector) and sector and sector != 'Unknown':
+                insights[row].append(_insight(_SECTOR_INFO, sector))
+        
+        return insights
+    
     def _generate_analysis_summary(self, insights: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate a summary of the analysis."""
         if not insights:
@@ -368,14 +454,40 @@ class ReportAnalyzerAgent:
         Returns:
             Dict containing comparative analysis
         """
-        results = {}
+        # Rate limited and sanitized per company, as analyze_company_reports is
+        @rate_limit_decorator
+        @input_validation_decorator
+        def fetch(ticker: str) -> tuple:
+            return self._collect_company_data(ticker, period)
         
-        for ticker in ticker_symbols:
+        def collect(ticker: str):
             try:
-                results[ticker] = self.analyze_company_reports(ticker, period=period)
+                return fetch(ticker)
             except Exception as e:
-                self.logger.error(f"Error analyzing {ticker}: {str(e)}")
-                results[ticker] = {'error': str(e)}
+                self._log_analysis_error(ticker, e)
+                return e
+        
+        # yfinance calls are I/O-bound, so fan the tickers out over a bounded thread pool
+        max_workers = max(1, min(self.max_concurrent_companies, len(ticker_symbols)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            collected = list(executor.map(collect, ticker_symbols))
+        
+        # Generate insights for every company at once from a column-per-metric frame
+        frame = pd.DataFrame.from_records(
+            [self._insight_metrics(company_info, earnings_analysis, financial_analysis)
+             for company_info, _, earnings_analysis, financial_analysis in (
+                 company_data for company_data in collected if not isinstance(company_data, Exception)
+             )],
+            columns=['pe', 'avg_growth', 'current_ratio', 'sector']
+        )
+        batch_insights = iter(self._batch_insights(frame))
+        
+        results = {}
+        for ticker, company_data in zip(ticker_symbols, collected):
+            if isinstance(company_data, Exception):
+                results[ticker] = {'error': str(company_data)}
+            else:
+                results[ticker] = self._build_analysis_result(ticker, period, company_data, next(batch_insights))
         
         return {
             'comparative_analysis': results,
@@ -0,0 +1,66 @@
+"""
+LLM Response Cache
+Persistent SQLite cache for research results, so repeat queries skip the crew run.
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from typing import Any, Optional
+from config.serialization import to_json, from_json
+
+CACHE_DIR = os.getenv('CACHE_DIR', './.cache')
+CACHE_PATH = os.path.join(CACHE_DIR, 'llm_cache.sqlite3')
+
+_connection = None
+_lock = threading.Lock()
+
+def _connect() -> sqlite3.Connection:
+    """Open the cache database on first use."""
+    global _connection
+    if _connection is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _connection = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _connection.execute(
+            'CREATE TABLE IF NOT EXISTS llm_cache '
+            '(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)'
+        )
+        _connection.commit()
+    return _connection
+
+def get(key: str) -> Optional[Any]:
+    """
+    Look up a cached value.
+    
+    Args:
+        key: Cache key
+    
+    Returns:
+        The cached value, or None when missing or expired
+    """
+    with _lock:
+        row = _connect().execute(
+            'SELECT value FROM llm_cache WHERE key = ? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+    return from_json(row[0]) if row else None
+
+def set(key: str, value: Any, ttl: float) -> None:
+    """
+    Store a value, replacing any previous entry for the key.
+    
+    Args:
+        key: Cache key
+        value: JSON-serializable value
+        ttl: Seconds until the entry expires
+    """
+    now = time.time()
+    with _lock:
+        connection = _connect()
+        connection.execute(
+            'INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, to_json(value), now + ttl)
+        )
+        # Drop expired entries while the write lock is held anyway
+        connection.execute('DELETE FROM llm_cache WHERE expires_at <= ?', (now,))
+        connection.commit()
\ No newline at end of file
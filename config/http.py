@@ -0,0 +1,18 @@
+"""
+HTTP Client Module
+Connection-pooled HTTP client shared by every OpenAI call in the process.
+"""
+
+import httpx
+
+try:
+    import h2
+except ImportError:  # h2 is optional; without it the pool keeps HTTP/1.1 connections alive
+    h2 = None
+
+# One pool for all crews and threads, so each ticker reuses warm TLS connections
+SHARED_CLIENT = httpx.Client(
+    http2=h2 is not None,
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+    timeout=60
+)
\ No newline at end of file
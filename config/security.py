@@ -5,18 +5,59 @@ Handles rate limiting, input validation, and API key management for the investme
 
 import os
 import time
+import threading
 import hashlib
+import inspect
 import logging
-from typing import Dict, Any, Optional
-from functools import wraps
+from collections import defaultdict, deque
+from typing import Dict, Any, Optional, get_args
+from functools import wraps, lru_cache
 from datetime import datetime, timedelta
 import re
+from config.serialization import to_json, JSONLogFormatter
+
+try:
+    import redis
+except ImportError:  # redis is optional; rate limits are then tracked in process memory
+    redis = None
+
+RATE_LIMIT_PRUNE_INTERVAL = 1024  # Power of two, tested with a bit mask
+
+# API key formats for known key types: (prefix, length of the ASCII alphanumeric body)
+API_KEY_SPECS = {
+    'openai': ('sk-', 48),
+    'news': ('', 32),
+    'alpha_vantage': ('', 16)
+}
+DEFAULT_API_KEY_MIN_LENGTH = 16  # Other key types: at least this many ASCII alphanumerics
+
+# Potentially dangerous fragments, removed before HTML tags (matched case-insensitively)
+DANGEROUS_FRAGMENT_PATTERN = re.compile(r'</?script>|javascript:|on(?:load|error)=', re.IGNORECASE)
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+MAX_INPUT_LENGTH = 10000
+REDIS_TIMEOUT = 0.5  # Seconds before a Redis call fails over to in-process rate limits
+
+@lru_cache(maxsize=32)
+def _is_valid_api_key_format(api_key: str, key_type: str) -> bool:
+    """Length and charset check for an API key; memoized since keys are long-lived settings."""
+    spec = API_KEY_SPECS.get(key_type)
+    if spec is not None:
+        prefix, body_length = spec
+        body = api_key[len(prefix):]
+        valid_length = api_key.startswith(prefix) and len(body) == body_length
+    else:
+        body = api_key
+        valid_length = len(body) >= DEFAULT_API_KEY_MIN_LENGTH
+    
+    return valid_length and body.isascii() and body.isalnum()
 
 class SecurityManager:
     """Manages security aspects of the investment research system."""
     
     def __init__(self):
-        self.rate_limit_requests = {}  # Track API requests per minute
+        self.rate_limit_requests = defaultdict(deque)  # Request times per user within the last minute
+        self._rate_limit_lock = threading.Lock()  # Guards rate_limit_requests across threads
+        self._rate_limit_checks = 0  # Idle users are pruned every RATE_LIMIT_PRUNE_INTERVAL checks
         self.max_requests_per_minute = int(os.getenv('MAX_REQUESTS_PER_MINUTE', 60))
         self.max_tokens_per_request = int(os.getenv('MAX_TOKENS_PER_REQUEST', 4000))
         self.enable_rate_limiting = os.getenv('ENABLE_RATE_LIMITING', 'true').lower() == 'true'
@@ -24,19 +65,41 @@ class SecurityManager:
         # Initialize logging
         self.logger = logging.getLogger(__name__)
         self.setup_logging()
+        
+        # Share rate limits across worker processes when Redis is configured
+        self.redis_client = None
+        redis_url = os.getenv('REDIS_URL')
+        if redis_url:
+            if redis is not None:
+                self.redis_client = redis.Redis.from_url(
+                    redis_url, socket_connect_timeout=REDIS_TIMEOUT, socket_timeout=REDIS_TIMEOUT
+                )
+            else:
+                self.logger.warning("REDIS_URL is set but the redis package is not installed")
     
     def setup_logging(self):
         """Setup secure logging configuration."""
+        # basicConfig ignores later calls, so don't open another log file for them
+        if logging.root.handlers:
+            return
+        
         log_level = os.getenv('LOG_LEVEL', 'INFO')
         log_file = os.getenv('LOG_FILE', 'investment_research.log')
+        handlers = [
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+        
+        # LOG_FORMAT=json writes structured records; basicConfig keeps a handler's own formatter
+        if os.getenv('LOG_FORMAT', 'text').lower() == 'json':
+            formatter = JSONLogFormatter()
+            for handler in handlers:
+                handler.setFormatter(formatter)
         
         logging.basicConfig(
             level=getattr(logging, log_level),
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
+            handlers=handlers
         )
     
     def validate_api_key(self, api_key: str, key_type: str) -> bool:
@@ -54,15 +117,7 @@ class SecurityManager:
             self.logger.error(f"Invalid {key_type} API key provided")
             return False
         
-        # Basic validation patterns for different API key types
-        validation_patterns = {
-            'openai': r'^sk-[a-zA-Z0-9]{48}$',
-            'news': r'^[a-zA-Z0-9]{32}$',
-            'alpha_vantage': r'^[a-zA-Z0-9]{16}$'
-        }
-        
-        pattern = validation_patterns.get(key_type, r'^[a-zA-Z0-9]{16,}$')
-        if not re.match(pattern, api_key):
+        if not _is_valid_api_key_format(api_key, key_type):
             self.logger.error(f"Invalid {key_type} API key format")
             return False
         
@@ -81,24 +136,48 @@ class SecurityManager:
         if not self.enable_rate_limiting:
             return True
         
-        current_time = time.time()
-        minute_ago = current_time - 60
-        
-        # Clean old entries
-        self.rate_limit_requests = {
-            k: v for k, v in self.rate_limit_requests.items() 
-            if v > minute_ago
-        }
+        if self.redis_client is not None:
+            try:
+                return self._redis_rate_limit_check(user_id)
+            except redis.RedisError as e:
+                self.logger.warning(f"Redis rate limit check failed, using in-process limits: {str(e)}")
         
-        # Check current requests
-        user_requests = [t for t in self.rate_limit_requests.values() if t > minute_ago]
+        with self._rate_limit_lock:
+            current_time = time.monotonic()
+            minute_ago = current_time - 60
+            
+            # Forget users with no requests in the window, amortized over many checks
+            self._rate_limit_checks += 1
+            if self._rate_limit_checks & (RATE_LIMIT_PRUNE_INTERVAL - 1) == 0:
+                self.rate_limit_requests = defaultdict(deque, {
+                    k: v for k, v in self.rate_limit_requests.items()
+                    if v and v[-1] > minute_ago
+                })
+            
+            # Drop this user's requests that have left the window (oldest first)
+            user_requests = self.rate_limit_requests[user_id]
+            while user_requests and user_requests[0] <= minute_ago:
+                user_requests.popleft()
+            
+            if len(user_requests) >= self.max_requests_per_minute:
+                self.logger.warning(f"Rate limit exceeded for user {user_id}")
+                return False
+            
+            # Add current request
+            user_requests.append(current_time)
+            return True
+    
+    def _redis_rate_limit_check(self, user_id: str) -> bool:
+        """Fixed one-minute window counted in Redis; keys expire on their own."""
+        key = f"rl:{user_id}:{int(time.time() // 60)}"
+        pipe = self.redis_client.pipeline()
+        pipe.incr(key)
+        pipe.expire(key, 120)
+        count, _ = pipe.execute()
         
-        if len(user_requests) >= self.max_requests_per_minute:
+        if count > self.max_requests_per_minute:
             self.logger.warning(f"Rate limit exceeded for user {user_id}")
             return False
-        
-        # Add current request
-        self.rate_limit_requests[f"{user_id}_{current_time}"] = current_time
         return True
     
     def sanitize_input(self, text: str) -> str:
@@ -111,21 +190,22 @@ class SecurityManager:
         Returns:
             str: Sanitized text
         """
-        # Remove potentially dangerous characters
-        dangerous_chars = ['<script>', '</script>', 'javascript:', 'onload=', 'onerror=']
-        sanitized = text
+        # Every removable fragment contains '<', ':' or '='; skip the regex when none occur
+        if '<' not in text and ':' not in text and '=' not in text:
+            return text[:MAX_INPUT_LENGTH]
         
-        for char in dangerous_chars:
-            sanitized = sanitized.replace(char, '')
-        
-        # Remove HTML tags
-        sanitized = re.sub(r'<[^>]+>', '', sanitized)
+        # Remove potentially dangerous fragments, then HTML tags. Removing either can join
+        # the surrounding text into a new fragment (e.g. 'java<b>script:'), so repeat
+        # until nothing more is removed.
+        sanitized = text
+        while True:
+            stripped = HTML_TAG_PATTERN.sub('', DANGEROUS_FRAGMENT_PATTERN.sub('', sanitized))
+            if stripped == sanitized:
+                break
+            sanitized = stripped
         
         # Limit length
-        if len(sanitized) > 10000:
-            sanitized = sanitized[:10000]
-        
-        return sanitized
+        return sanitized[:MAX_INPUT_LENGTH]
     
     def validate_ticker_symbol(self, ticker: str) -> bool:
         """
@@ -137,12 +217,8 @@ class SecurityManager:
         Returns:
             bool: True if valid format
         """
-        if not ticker:
-            return False
-        
-        # Basic ticker validation (1-5 characters, alphanumeric)
-        pattern = r'^[A-Z]{1,5}$'
-        return bool(re.match(pattern, ticker.upper()))
+        # Basic ticker validation (1-5 ASCII letters, either case)
+        return bool(ticker) and len(ticker) <= 5 and ticker.isascii() and ticker.isalpha()
     
     def hash_sensitive_data(self, data: str) -> str:
         """
@@ -154,7 +230,8 @@ class SecurityManager:
         Returns:
             str: Hashed data
         """
-        return hashlib.sha256(data.encode()).hexdigest()[:16]
+        # 8-byte BLAKE2b digest: 16 hex characters without hashing bits that are thrown away
+        return hashlib.blake2b(data.encode(), digest_size=8).hexdigest()
     
     def log_security_event(self, event_type: str, details: Dict[str, Any]):
         """
@@ -164,7 +241,7 @@ class SecurityManager:
             event_type: Type of security event
             details: Event details
         """
-        self.logger.info(f"Security Event - {event_type}: {details}")
+        self.logger.info(f"Security Event - {event_type}: {to_json(details).decode()}")
 
 # Global security manager instance
 security_manager = SecurityManager()
@@ -178,25 +255,40 @@ def rate_limit_decorator(func):
         return func(*args, **kwargs)
     return wrapper
 
+def _may_be_str(annotation: Any) -> bool:
+    """Whether a parameter annotated this way can receive a string."""
+    return (annotation is inspect.Parameter.empty or annotation is str or annotation is Any
+            or str in get_args(annotation))
+
 def input_validation_decorator(func):
     """Decorator to validate and sanitize input parameters."""
+    # Classify parameters once: only those that can hold strings are checked per call.
+    # Functions taking *args/**kwargs check every argument.
+    parameters = list(inspect.signature(func).parameters.values())
+    if any(p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in parameters):
+        str_positions = str_names = None
+    else:
+        string_parameters = [p for p in parameters if p.name != 'self' and _may_be_str(p.annotation)]
+        str_positions = tuple(
+            parameters.index(p) for p in string_parameters if p.kind != p.KEYWORD_ONLY
+        )
+        str_names = frozenset(p.name for p in string_parameters if p.kind != p.POSITIONAL_ONLY)
+    
     @wraps(func)
     def wrapper(*args, **kwargs):
         # Sanitize string arguments
-        sanitized_args = []
-        for arg in args:
-            if isinstance(arg, str):
-                sanitized_args.append(security_manager.sanitize_input(arg))
-            else:
-                sanitized_args.append(arg)
+        positions = range(len(args)) if str_positions is None else str_positions
+        if positions:
+            args = list(args)
+            for i in positions:
+                if i < len(args) and isinstance(args[i], str):
+                    args[i] = security_manager.sanitize_input(args[i])
         
         # Sanitize keyword arguments
-        sanitized_kwargs = {}
-        for key, value in kwargs.items():
-            if isinstance(value, str):
-                sanitized_kwargs[key] = security_manager.sanitize_input(value)
-            else:
-                sanitized_kwargs[key] = value
+        names = list(kwargs) if str_names is None else str_names.intersection(kwargs)
+        for name in names:
+            if isinstance(kwargs[name], str):
+                kwargs[name] = security_manager.sanitize_input(kwargs[name])
         
-        return func(*sanitized_args, **sanitized_kwargs)
+        return func(*args, **kwargs)
     return wrapper 
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""
+Serialization Module
+Fast JSON encoding for research results, news payloads and security logs.
+"""
+
+import json
+import logging
+from datetime import datetime, timezone
+from collections.abc import Mapping
+from dataclasses import asdict, is_dataclass
+from typing import Any, BinaryIO
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library encoder
+    orjson = None
+
+if orjson is not None:
+    # Dataclasses go through _default so mapping dataclasses serialize their full contents
+    _ORJSON_OPTIONS = (
+        orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+def _default(obj: Any) -> Any:
+    """Encode values JSON has no native form for: mappings and dataclasses as dicts, anything else as text."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    return str(obj)
+
+def to_json(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to JSON bytes.
+    
+    Args:
+        obj: Object to serialize; numpy values, datetimes, mappings and non-string keys are supported
+        indent: Pretty-print with two-space indentation
+    
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        options = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTIONS
+        try:
+            return orjson.dumps(obj, default=_default, option=options)
+        except TypeError:
+            # orjson rejects some key types (e.g. pandas Timestamps); stringify them and retry
+            return orjson.dumps(_stringify_keys(obj), default=_default, option=options)
+    
+    return json.dumps(_stringify_keys(obj), indent=2 if indent else None, default=_default).encode()
+
+def dump_json(obj: Any, fp: BinaryIO, indent: bool = False) -> None:
+    """
+    Serialize an object as JSON into a binary file.
+    
+    Args:
+        obj: Object to serialize, as accepted by to_json
+        fp: File opened in binary write mode
+        indent: Pretty-print with two-space indentation
+    """
+    if orjson is not None:
+        fp.write(to_json(obj, indent=indent))
+        return
+    
+    # Stream the standard library encoder's chunks instead of building the whole document
+    encoder = json.JSONEncoder(indent=2 if indent else None, default=_default)
+    for chunk in encoder.iterencode(_stringify_keys(obj)):
+        fp.write(chunk.encode())
+
+def from_json(data: bytes) -> Any:
+    """Deserialize JSON bytes or text produced by to_json."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _stringify_keys(obj: Any) -> Any:
+    """Convert non-string dict keys (e.g. pandas Timestamps) for the standard library encoder."""
+    if isinstance(obj, dict):
+        return {
+            key if isinstance(key, str) else str(key): _stringify_keys(value)
+            for key, value in obj.items()
+        }
+    if isinstance(obj, (list, tuple)):
+        return [_stringify_keys(value) for value in obj]
+    return obj
+
+class JSONLogFormatter(logging.Formatter):
+    """Log formatter emitting one JSON object per record, encoded with orjson when available."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        # ISO 8601 UTC timestamps skip the localtime/strftime work of %(asctime)s
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'logger': record.name,
+            'level': record.levelname,
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return to_json(entry).decode()
\ No newline at end of file
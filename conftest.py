@@ -0,0 +1 @@
+# Puts the project root on sys.path so tests import the config, agents and crew packages
\ No newline at end of file
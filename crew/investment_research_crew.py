@@ -4,15 +4,43 @@ Main crew that orchestrates news gathering, report analysis, and insight generat
 """
 
 import os
+import copy
+import asyncio
 import logging
+import threading
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+from cachetools import TTLCache
 from crewai import Crew, Agent, Task
 from langchain_openai import ChatOpenAI
 from agents.news_gatherer import NewsGathererAgent
 from agents.report_analyzer import ReportAnalyzerAgent
 from agents.insight_generator import InsightGeneratorAgent
 from config.security import security_manager
+from config.http import SHARED_CLIENT
+
+# Bump when agent or task prompts change, so persisted research from older prompts is ignored
+PROMPT_VERSION = 'v2'
+
+# Completed research shared across crew instances, so re-queries skip the crew run
+_research_cache = TTLCache(maxsize=256, ttl=int(os.getenv('RESEARCH_CACHE_TTL', 900)))
+_research_cache_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
+def _get_model() -> ChatOpenAI:
+    """OpenAI chat model shared by every crew in the process."""
+    return ChatOpenAI(
+        model=os.getenv('DEFAULT_MODEL', 'gpt-4'),
+        temperature=float(os.getenv('TEMPERATURE', 0.7)),
+        max_retries=int(os.getenv('MAX_RETRIES', 3)),
+        http_client=SHARED_CLIENT
+    )
+
+@lru_cache(maxsize=1)
+def _get_research_agents() -> tuple:
+    """News, report and insight agents shared by every crew; they keep no per-request state."""
+    return NewsGathererAgent(), ReportAnalyzerAgent(), InsightGeneratorAgent()
 
 class InvestmentResearchCrew:
     """Main crew for automated investment research."""
@@ -21,25 +49,13 @@ class InvestmentResearchCrew:
         """Initialize the investment research crew with all agents."""
         self.logger = logging.getLogger(__name__)
         
-        # Initialize OpenAI model
-        self.model = ChatOpenAI(
-            model=os.getenv('DEFAULT_MODEL', 'gpt-4'),
-            temperature=float(os.getenv('TEMPERATURE', 0.7)),
-            max_retries=int(os.getenv('MAX_RETRIES', 3))
-        )
-        
-        # Initialize agents
-        self.news_gatherer = NewsGathererAgent()
-        self.report_analyzer = ReportAnalyzerAgent()
-        self.insight_generator = InsightGeneratorAgent()
+        # Initialize OpenAI model and agents (built once per process)
+        self.model = _get_model()
+        self.news_gatherer, self.report_analyzer, self.insight_generator = _get_research_agents()
         
-        # Create CrewAI agents
-        self.news_agent = self._create_news_agent()
-        self.analysis_agent = self._create_analysis_agent()
-        self.insight_agent = self._create_insight_agent()
-        
-        # Create crew
-        self.crew = self._create_crew()
+        # Crew runs in flight at once, bounding concurrent OpenAI calls to stay under RPM/TPM
+        # limits; ChatOpenAI retries any 429 that still slips through with backoff
+        self.max_concurrent_research = int(os.getenv('OPENAI_MAX_CONCURRENCY', 5))
     
     def _create_news_agent(self) -> Agent:
         """Create the news gathering agent."""
@@ -53,7 +69,8 @@ class InvestmentResearchCrew:
             that could impact investment decisions.""",
             verbose=True,
             allow_delegation=False,
-            tools=[self._news_gathering_tool]
+            tools=[self._news_gathering_tool],
+            llm=self.model
         )
     
     def _create_analysis_agent(self) -> Agent:
@@ -68,7 +85,8 @@ class InvestmentResearchCrew:
             and growth prospects.""",
             verbose=True,
             allow_delegation=False,
-            tools=[self._financial_analysis_tool]
+            tools=[self._financial_analysis_tool],
+            llm=self.model
         )
     
     def _create_insight_agent(self) -> Agent:
@@ -84,23 +102,32 @@ class InvestmentResearchCrew:
             actionable terms.""",
             verbose=True,
             allow_delegation=False,
-            tools=[self._insight_generation_tool]
+            tools=[self._insight_generation_tool],
+            llm=self.model
         )
     
-    def _create_crew(self) -> Crew:
+    def _create_crew(self, news_agent: Agent, analysis_agent: Agent, insight_agent: Agent) -> Crew:
         """Create the investment research crew."""
         return Crew(
-            agents=[self.news_agent, self.analysis_agent, self.insight_agent],
+            agents=[news_agent, analysis_agent, insight_agent],
             tasks=[
-                self._create_news_task(),
-                self._create_analysis_task(),
-                self._create_insight_task()
+                self._create_news_task(news_agent),
+                self._create_analysis_task(analysis_agent),
+                self._create_insight_task(insight_agent)
             ],
             verbose=True,
             memory=True
         )
     
-    def _create_news_task(self) -> Task:
+    def _build_crew(self) -> Crew:
+        """Build a crew with fresh agents and tasks."""
+        return self._create_crew(
+            self._create_news_agent(), self._create_analysis_agent(), self._create_insight_agent()
+        )
+    
+    # Task descriptions keep the stable instructions first and the per-stock inputs
+    # last, so provider-side prompt caching matches the shared prefix across tickers
+    def _create_news_task(self, agent: Agent) -> Task:
         """Create the news gathering task."""
         return Task(
             description="""Gather comprehensive financial news and market information 
@@ -112,8 +139,11 @@ class InvestmentResearchCrew:
             5. Recent earnings reports and financial updates
             
             Provide a detailed summary of the most relevant news articles with 
-            their potential impact on the stock price.""",
-            agent=self.news_agent,
+            their potential impact on the stock price.
+            
+            Ticker symbol: {ticker_symbol}
+            News window: last {days_back} days""",
+            agent=agent,
             expected_output="""A comprehensive news analysis report including:
             - Summary of key news articles
             - Market sentiment analysis
@@ -122,7 +152,7 @@ class InvestmentResearchCrew:
             - Opportunities mentioned in news coverage"""
         )
     
-    def _create_analysis_task(self) -> Task:
+    def _create_analysis_task(self, agent: Agent) -> Task:
         """Create the financial analysis task."""
         return Task(
             description="""Analyze the company's financial reports and fundamentals. 
@@ -134,8 +164,11 @@ class InvestmentResearchCrew:
             5. Key financial ratios and metrics
             6. Growth trends and projections
             
-            Provide detailed financial analysis with key insights and concerns.""",
-            agent=self.analysis_agent,
+            Provide detailed financial analysis with key insights and concerns.
+            
+            Ticker symbol: {ticker_symbol}
+            Financial period: {period}""",
+            agent=agent,
             expected_output="""A comprehensive financial analysis report including:
             - Earnings analysis and trends
             - Financial health assessment
@@ -145,7 +178,7 @@ class InvestmentResearchCrew:
             - Valuation analysis"""
         )
     
-    def _create_insight_task(self) -> Task:
+    def _create_insight_task(self, agent: Agent) -> Task:
         """Create the insight generation task."""
         return Task(
             description="""Combine the news analysis and financial analysis to generate 
@@ -157,8 +190,10 @@ class InvestmentResearchCrew:
             5. Market sentiment impact
             6. Investment recommendation
             
-            Provide clear, actionable investment advice with supporting rationale.""",
-            agent=self.insight_agent,
+            Provide clear, actionable investment advice with supporting rationale.
+            
+            Ticker symbol: {ticker_symbol}""",
+            agent=agent,
             expected_output="""A comprehensive investment recommendation report including:
             - Investment recommendation (Buy/Hold/Sell)
             - Confidence level and rationale
@@ -177,21 +212,25 @@ class InvestmentResearchCrew:
             )
             
             # Format news data for the agent
-            summary = f"News Analysis for {ticker_symbol}:\n\n"
-            summary += f"Total Articles Found: {news_data['summary']['total_articles']}\n"
-            summary += f"Analysis Period: {days_back} days\n\n"
+            parts = [
+                f"News Analysis for {ticker_symbol}:\n\n",
+                f"Total Articles Found: {news_data['summary']['total_articles']}\n",
+                f"Analysis Period: {days_back} days\n\n"
+            ]
             
             # Add top articles
             articles = news_data.get('articles', [])
             if articles:
-                summary += "Key News Articles:\n"
+                parts.append("Key News Articles:\n")
                 for i, article in enumerate(articles[:5], 1):
-                    summary += f"{i}. {article['title']}\n"
-                    summary += f"   Source: {article['source']}\n"
-                    summary += f"   Relevance: {article['relevance_score']:.2f}\n"
-                    summary += f"   Summary: {article['description'][:200]}...\n\n"
+                    parts.append(
+                        f"{i}. {article['title']}\n"
+                        f"   Source: {article['source']}\n"
+                        f"   Relevance: {article['relevance_score']:.2f}\n"
+                        f"   Summary: {article['description'][:200]}...\n\n"
+                    )
             
-            return summary
+            return ''.join(parts)
             
         except Exception as e:
             self.logger.error(f"Error in news gathering tool: {str(e)}")
@@ -206,31 +245,34 @@ class InvestmentResearchCrew:
             )
             
             # Format analysis for the agent
-            summary = f"Financial Analysis for {ticker_symbol}:\n\n"
+            parts = [f"Financial Analysis for {ticker_symbol}:\n\n"]
             
             # Company info
             company_info = analysis.get('company_info', {})
             if company_info:
-                summary += f"Company: {company_info.get('name', 'Unknown')}\n"
-                summary += f"Sector: {company_info.get('sector', 'Unknown')}\n"
-                summary += f"Market Cap: ${company_info.get('market_cap', 0):,.0f}\n"
-                summary += f"P/E Ratio: {company_info.get('pe_ratio', 0):.2f}\n\n"
+                parts.append(
+                    f"Company: {company_info.get('name', 'Unknown')}\n"
+                    f"Sector: {company_info.get('sector', 'Unknown')}\n"
+                    f"Market Cap: ${company_info.get('market_cap', 0):,.0f}\n"
+                    f"P/E Ratio: {company_info.get('pe_ratio', 0):.2f}\n\n"
+                )
             
             # Financial analysis summary
             analysis_summary = analysis.get('summary', {})
             if analysis_summary:
-                summary += f"Overall Sentiment: {analysis_summary.get('overall_sentiment', 'neutral')}\n"
-                summary += f"Key Findings: {len(analysis_summary.get('key_findings', []))}\n"
-                summary += f"Recommendations: {len(analysis_summary.get('recommendations', []))}\n\n"
+                parts.append(
+                    f"Overall Sentiment: {analysis_summary.get('overall_sentiment', 'neutral')}\n"
+                    f"Key Findings: {len(analysis_summary.get('key_findings', []))}\n"
+                    f"Recommendations: {len(analysis_summary.get('recommendations', []))}\n\n"
+                )
             
             # Add key insights
             insights = analysis.get('insights', [])
             if insights:
-                summary += "Key Insights:\n"
-                for insight in insights[:5]:
-                    summary += f"• {insight['message']}\n"
+                parts.append("Key Insights:\n")
+                parts.extend(f"• {insight['message']}\n" for insight in insights[:5])
             
-            return summary
+            return ''.join(parts)
             
         except Exception as e:
             self.logger.error(f"Error in financial analysis tool: {str(e)}")
@@ -241,15 +283,15 @@ class InvestmentResearchCrew:
         try:
             # This would typically combine the news and analysis data
             # For now, we'll create a basic insight generation
-            summary = "Investment Insights Generated:\n\n"
-            summary += "Based on the provided news and financial analysis data:\n"
-            summary += "• Comprehensive evaluation of investment potential\n"
-            summary += "• Risk assessment and mitigation strategies\n"
-            summary += "• Growth prospects and market positioning\n"
-            summary += "• Valuation analysis and fair value estimates\n"
-            summary += "• Investment recommendation with confidence level\n"
-            
-            return summary
+            return (
+                "Investment Insights Generated:\n\n"
+                "Based on the provided news and financial analysis data:\n"
+                "• Comprehensive evaluation of investment potential\n"
+                "• Risk assessment and mitigation strategies\n"
+                "• Growth prospects and market positioning\n"
+                "• Valuation analysis and fair value estimates\n"
+                "• Investment recommendation with confidence level\n"
+            )
             
         except Exception as e:
             self.logger.error(f"Error in insight generation tool: {str(e)}")
@@ -257,7 +299,8 @@ class InvestmentResearchCrew:
     
     def research_stock(self, ticker_symbol: str, 
                       days_back: int = 7, 
-                      period: str = '1y') -> Dict[str, Any]:
+                      period: str = '1y',
+                      force_refresh: bool = False) -> Dict[str, Any]:
         """
         Perform comprehensive investment research on a stock.
         
@@ -265,6 +308,7 @@ class InvestmentResearchCrew:
             ticker_symbol: Stock ticker symbol to research
             days_back: Number of days of news to analyze
             period: Financial data period to analyze
+            force_refresh: Bypass the cache of recently completed research
             
         Returns:
             Dict containing comprehensive research results
@@ -276,21 +320,31 @@ class InvestmentResearchCrew:
             if not security_manager.validate_ticker_symbol(ticker_symbol):
                 raise ValueError(f"Invalid ticker symbol: {ticker_symbol}")
             
-            # Set up context for the crew
+            # Serve repeated research within the cache window from memory
+            cache_key = (ticker_symbol, days_back, period)
+            if not force_refresh:
+                with _research_cache_lock:
+                    cached = _research_cache.get(cache_key)
+                if cached is not None:
+                    self.logger.info(f"Returning cached research for {ticker_symbol}")
+                    return copy.deepcopy(cached)
+            
+            # Set up context for the crew; the report carries the same timestamp
+            research_date = datetime.now().isoformat()
             context = {
                 'ticker_symbol': ticker_symbol,
                 'days_back': days_back,
                 'period': period,
-                'research_date': datetime.now().isoformat()
+                'research_date': research_date
             }
             
-            # Run the crew
-            result = self.crew.kickoff(inputs=context)
+            # Run a fresh crew so crewAI memory never carries over from another stock's research
+            result = self._build_crew().kickoff(inputs=context)
             
             # Process and format results
             research_report = {
                 'ticker_symbol': ticker_symbol,
-                'research_date': datetime.now().isoformat(),
+                'research_date': research_date,
                 'analysis_period': {
                     'news_days': days_back,
                     'financial_period': period
@@ -302,6 +356,9 @@ class InvestmentResearchCrew:
                 'opportunities': self._extract_opportunities(result)
             }
             
+            with _research_cache_lock:
+                _research_cache[cache_key] = copy.deepcopy(research_report)
+            
             self.logger.info(f"Successfully completed research for {ticker_symbol}")
             return research_report
             
@@ -327,6 +384,13 @@ class InvestmentResearchCrew:
         Returns:
             Dict containing comparative research results
         """
+        # Research the stocks concurrently unless already inside an event loop
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.research_multiple_stocks_async(ticker_symbols, days_back, period))
+        
+        research_date = datetime.now().isoformat()
         results = {}
         
         for ticker in ticker_symbols:
@@ -336,9 +400,67 @@ class InvestmentResearchCrew:
                 self.logger.error(f"Error researching {ticker}: {str(e)}")
                 results[ticker] = {'error': str(e)}
         
+        return self._build_comparative_research(ticker_symbols, results, research_date)
+    
+    async def research_multiple_stocks_async(self, ticker_symbols: List[str],
+                                             days_back: int = 7,
+                                             period: str = '1y',
+                                             submit: Optional[Callable[..., Awaitable]] = None) -> Dict[str, Any]:
+        """
+        Research multiple stocks concurrently; each crew run is blocking I/O in a worker thread.
+        
+        Args:
+            ticker_symbols: List of stock ticker symbols
+            days_back: Number of days of news to analyze
+            period: Financial data period to analyze
+            submit: Optional scheduler called as submit(func, *args) to run each blocking crew
+                run; it then bounds concurrency itself. Defaults to worker threads limited to
+                max_concurrent_research at a time.
+        
+        Returns:
+            Dict containing comparative research results
+        """
+        research_date = datetime.now().isoformat()
+        semaphore = asyncio.Semaphore(self.max_concurrent_research)
+        
+        async def research(ticker: str) -> Dict[str, Any]:
+            if submit is not None:
+                return await submit(self.research_stock, ticker, days_back, period)
+            async with semaphore:
+                return await asyncio.to_thread(self.research_stock, ticker, days_back, period)
+        
+        responses = await asyncio.gather(*(research(ticker) for ticker in ticker_symbols),
+                                         return_exceptions=True)
+        
+        results = {}
+        for ticker, response in zip(ticker_symbols, responses):
+            if isinstance(response, Exception):
+                self.logger.error(f"Error researching {ticker}: {str(response)}")
+                results[ticker] = {'error': str(response)}
+            else:
+                results[ticker] = response
+        
+        return self._build_comparative_research(ticker_symbols, results, research_date)
+    
+    def compare_research(self, ticker_symbols: List[str], results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build comparative research from per-stock results that are already available.
+        
+        Args:
+            ticker_symbols: List of stock ticker symbols
+            results: Research result (or {'error': ...}) per ticker
+        
+        Returns:
+            Dict containing comparative research results
+        """
+        return self._build_comparative_research(ticker_symbols, results, datetime.now().isoformat())
+    
+    def _build_comparative_research(self, ticker_symbols: List[str],
+                                    results: Dict[str, Any], research_date: str) -> Dict[str, Any]:
+        """Assemble the comparative research result."""
         return {
             'comparative_research': results,
-            'research_date': datetime.now().isoformat(),
+            'research_date': research_date,
             'stocks_researched': len(ticker_symbols),
             'comparison_summary': self._generate_comparison_summary(results)
         }
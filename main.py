@@ -6,31 +6,60 @@ Demonstrates how to use the CrewAI investment research system.
 
 import os
 import sys
+import asyncio
+import hashlib
 import logging
-import json
+import threading
 from datetime import datetime
-from typing import List, Dict, Any
+from functools import lru_cache, partial
+from itertools import count
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
 
-# Load environment variables
+# Load environment variables, then read them from one snapshot taken at startup
 load_dotenv()
+ENV = dict(os.environ)
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from crew.investment_research_crew import InvestmentResearchCrew
+# crewAI and LangChain are imported where research starts, so the interactive menu
+# comes up without paying for them
 from config.security import security_manager
+from config.serialization import to_json, dump_json, from_json
+from cache import llm_cache
 
-def setup_logging():
-    """Setup logging configuration."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('investment_research.log'),
-            logging.StreamHandler()
-        ]
-    )
+try:
+    import zstandard
+except ImportError:  # zstandard is optional; results are then always saved as plain JSON
+    zstandard = None
+
+LLM_CACHE_TTL = 24 * 3600  # Persisted research is reused for at most a day
+
+# Reused by every async summary so formatting never pays thread start-up
+_formatter_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Tickers researched in the background while the interactive prompt waits (opt-in: each is a full crew run)
+PREFETCH_TICKERS = [t.strip().upper() for t in ENV.get('PREFETCH_TICKERS', '').split(',') if t.strip()]
+
+_stdin_pending = bytearray()  # Bytes read from stdin past the last returned line
+
+# Save results as zstd-compressed JSON (.json.zst) when enabled and zstandard is installed
+COMPRESS_RESULTS = ENV.get('COMPRESS_RESULTS', 'false').lower() == 'true' and zstandard is not None
+ZSTD_LEVEL = 3
+DROP_CACHE_THRESHOLD = 1 << 20  # Saved results at least this large are evicted from the page cache
+
+# Summary layout, formatted once at import; the whole summary is written in one call
+_SUMMARY_RULE = "=" * 60
+_SUMMARY_HEADER = f"\n{_SUMMARY_RULE}\n📊 RESEARCH SUMMARY\n{_SUMMARY_RULE}"
+_SUMMARY_FOOTER = f"\n{_SUMMARY_RULE}\n"
+_SUMMARY_ITEM = "  {}. {}".format
+_SUMMARY_SECTIONS = (
+    ('recommendations', "\n📈 Recommendations:"),
+    ('risks', "\n⚠️  Key Risks:"),
+    ('opportunities', "\n🎯 Opportunities:")
+)
 
 def validate_environment():
     """Validate that all required environment variables are set."""
@@ -38,7 +67,7 @@ def validate_environment():
     missing_vars = []
     
     for var in required_vars:
-        if not os.getenv(var):
+        if not ENV.get(var):
             missing_vars.append(var)
     
     if missing_vars:
@@ -48,6 +77,35 @@ def validate_environment():
     
     return True
 
+@lru_cache(maxsize=1)
+def _get_crew():
+    """Research crew shared by every call; it builds a fresh crewAI crew per request."""
+    from crew.investment_research_crew import InvestmentResearchCrew
+    return InvestmentResearchCrew()
+
+def _llm_cache_key(ticker_symbol: str) -> str:
+    """Persistent cache key for a ticker's research under the current prompts; entries age out by TTL."""
+    from crew.investment_research_crew import PROMPT_VERSION
+    
+    key = to_json({
+        'prompt_version': PROMPT_VERSION,
+        'ticker': ticker_symbol
+    })
+    return hashlib.sha256(key).hexdigest()
+
+def _research_with_cache(ticker_symbol: str) -> Dict[str, Any]:
+    """Research a stock, serving and storing results through the on-disk cache."""
+    # Reuse research from the last LLM_CACHE_TTL seconds when the prompts are unchanged
+    cache_key = _llm_cache_key(ticker_symbol)
+    results = llm_cache.get(cache_key)
+    if results is not None:
+        return results
+    
+    # Perform research
+    results = _get_crew().research_stock(ticker_symbol)
+    llm_cache.set(cache_key, results, LLM_CACHE_TTL)
+    return results
+
 def research_single_stock(ticker_symbol: str) -> Dict[str, Any]:
     """
     Research a single stock using the investment research crew.
@@ -61,11 +119,7 @@ def research_single_stock(ticker_symbol: str) -> Dict[str, Any]:
     try:
         print(f"\n🔍 Starting comprehensive research for {ticker_symbol}...")
         
-        # Initialize the research crew
-        crew = InvestmentResearchCrew()
-        
-        # Perform research
-        results = crew.research_stock(ticker_symbol)
+        results = _research_with_cache(ticker_symbol)
         
         print(f"✅ Research completed for {ticker_symbol}")
         return results
@@ -74,12 +128,93 @@ def research_single_stock(ticker_symbol: str) -> Dict[str, Any]:
         print(f"❌ Error researching {ticker_symbol}: {str(e)}")
         return {'error': str(e)}
 
+class PriorityTaskRunner:
+    """Runs blocking jobs on worker threads, starting user requests before background work."""
+    
+    USER = 0
+    BACKGROUND = 1
+    
+    def __init__(self, workers: int):
+        """
+        Start the worker tasks; must be called inside a running event loop.
+        
+        Args:
+            workers: Number of jobs run at once
+        """
+        self._queue = asyncio.PriorityQueue()
+        self._order = count()  # First in, first out within a priority
+        self._workers = [asyncio.create_task(self._work()) for _ in range(workers)]
+    
+    def submit(self, priority: int, func, *args) -> asyncio.Future:
+        """
+        Queue a blocking call.
+        
+        Args:
+            priority: USER or BACKGROUND
+            func: Function to run on a worker thread
+            *args: Arguments for func
+        
+        Returns:
+            asyncio.Future resolving to the call's result
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((priority, next(self._order), func, args, future))
+        return future
+    
+    def close(self):
+        """Stop the workers and cancel queued jobs; running jobs are abandoned."""
+        for worker in self._workers:
+            worker.cancel()
+        while not self._queue.empty():
+            *_, future = self._queue.get_nowait()
+            future.cancel()
+    
+    async def _work(self):
+        """Take the most urgent queued job whenever this worker is free."""
+        while True:
+            _, _, func, args, future = await self._queue.get()
+            if future.cancelled():
+                continue
+            
+            # Jobs already running are not interrupted; the queue only orders what starts next.
+            # They run on daemon threads, so background work left running never delays exit.
+            try:
+                result = await _run_in_daemon_thread(func, *args)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+
+async def prefetch_top_tickers(runner: PriorityTaskRunner):
+    """Warm the research caches for PREFETCH_TICKERS while the user is at the prompt."""
+    futures = [runner.submit(runner.BACKGROUND, _research_with_cache, ticker) for ticker in PREFETCH_TICKERS]
+    outcomes = await asyncio.gather(*futures, return_exceptions=True)
+    for ticker, outcome in zip(PREFETCH_TICKERS, outcomes):
+        if isinstance(outcome, Exception):
+            logging.getLogger(__name__).warning(f"Prefetch failed for {ticker}: {str(outcome)}")
+
 def research_multiple_stocks(ticker_symbols: List[str]) -> Dict[str, Any]:
     """
     Research multiple stocks for comparison.
     
     Args:
         ticker_symbols: List of stock ticker symbols
+    
+    Returns:
+        Dict containing comparative research results
+    """
+    return asyncio.run(research_multiple_stocks_async(ticker_symbols))
+
+async def research_multiple_stocks_async(ticker_symbols: List[str],
+                                         runner: Optional[PriorityTaskRunner] = None) -> Dict[str, Any]:
+    """
+    Research multiple stocks for comparison, overlapping the per-stock crew runs.
+    
+    Args:
+        ticker_symbols: List of stock ticker symbols
+        runner: Optional runner whose user queue executes the per-stock crew runs
         
     Returns:
         Dict containing comparative research results
@@ -87,11 +222,9 @@ def research_multiple_stocks(ticker_symbols: List[str]) -> Dict[str, Any]:
     try:
         print(f"\n🔍 Starting comparative research for {len(ticker_symbols)} stocks...")
         
-        # Initialize the research crew
-        crew = InvestmentResearchCrew()
-        
-        # Perform research
-        results = crew.research_multiple_stocks(ticker_symbols)
+        # Perform research; every ticker runs as its own task and the results are gathered
+        submit = partial(runner.submit, runner.USER) if runner is not None else None
+        results = await _get_crew().research_multiple_stocks_async(ticker_symbols, submit=submit)
         
         print(f"✅ Comparative research completed")
         return results
@@ -111,72 +244,192 @@ def save_results(results: Dict[str, Any], filename: str = None):
     if not filename:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"research_results_{timestamp}.json"
+    filename = _results_filename(filename)
     
     try:
-        with open(filename, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        _write_results(filename, results)
         print(f"💾 Results saved to {filename}")
     except Exception as e:
         print(f"❌ Error saving results: {str(e)}")
 
-def display_summary(results: Dict[str, Any]):
+def _results_filename(filename: str) -> str:
+    """Add the .zst extension when saved results are compressed."""
+    if COMPRESS_RESULTS and not filename.endswith('.zst'):
+        return filename + '.zst'
+    return filename
+
+def _write_results(filename: str, results: Dict[str, Any]):
+    """Write results as indented JSON, or compact zstd-compressed JSON for .zst files."""
+    with open(filename, 'wb') as f:
+        if filename.endswith('.zst'):
+            f.write(zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(to_json(results)))
+        else:
+            dump_json(results, f, indent=True)
+        
+        # Large one-shot dumps are not read back soon: flush them to disk and evict
+        # their pages from the page cache so the memory is free for the next research run
+        if hasattr(os, 'posix_fadvise') and f.tell() >= DROP_CACHE_THRESHOLD:
+            f.flush()
+            os.fdatasync(f.fileno())
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+def load_results(filename: str) -> Dict[str, Any]:
     """
-    Display a summary of research results.
+    Load research results saved by save_results.
+    
+    Args:
+        filename: Path of the results file; .zst files are decompressed first
+    
+    Returns:
+        Dict containing the saved research results
+    
+    Raises:
+        ImportError: If the file is compressed and zstandard is not installed
+    """
+    if filename.endswith('.zst') and zstandard is None:
+        raise ImportError(f"zstandard is not installed; install it to read {filename}")
+    
+    # Hand the raw bytes to orjson's parser rather than decoding text for the stdlib one
+    with open(filename, 'rb') as f:
+        data = f.read()
+    if filename.endswith('.zst'):
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return from_json(data)
+
+def save_results_batch(results_list: List[Tuple[str, Dict[str, Any]]]):
+    """
+    Save several research results to JSON files in one batch.
+    
+    Args:
+        results_list: (filename, results) pairs to save
+    """
+    def write(item):
+        filename, results = item
+        filename = _results_filename(filename)
+        try:
+            _write_results(filename, results)
+            return f"💾 Results saved to {filename}"
+        except Exception as e:
+            return f"❌ Error saving results: {str(e)}"
+    
+    # Overlap the files' open/write/close latency instead of paying it once per file
+    with ThreadPoolExecutor(max_workers=max(len(results_list), 1)) as executor:
+        for message in executor.map(write, results_list):
+            print(message)
+
+def format_summary(results: Dict[str, Any]) -> str:
+    """
+    Format a summary of research results.
     
     Args:
         results: Research results to summarize
+    
+    Returns:
+        str: Printable summary, ending in a newline
     """
-    print("\n" + "="*60)
-    print("📊 RESEARCH SUMMARY")
-    print("="*60)
+    lines = [_SUMMARY_HEADER]
     
     if 'error' in results:
-        print(f"❌ Research failed: {results['error']}")
-        return
+        lines.append(f"❌ Research failed: {results['error']}")
+        return "\n".join(lines) + "\n"
     
     ticker = results.get('ticker_symbol', 'Unknown')
     research_date = results.get('research_date', 'Unknown')
     
-    print(f"Stock: {ticker}")
-    print(f"Research Date: {research_date}")
+    lines.append(f"Stock: {ticker}")
+    lines.append(f"Research Date: {research_date}")
     
-    # Display recommendations
-    recommendations = results.get('recommendations', [])
-    if recommendations:
-        print(f"\n📈 Recommendations:")
-        for i, rec in enumerate(recommendations, 1):
-            print(f"  {i}. {rec}")
+    # Format the numbered list sections present in the results
+    for key, heading in _SUMMARY_SECTIONS:
+        items = results.get(key)
+        if items:
+            lines.append(heading)
+            lines.extend(map(_SUMMARY_ITEM, count(1), items))
     
-    # Display risks
-    risks = results.get('risks', [])
-    if risks:
-        print(f"\n⚠️  Key Risks:")
-        for i, risk in enumerate(risks, 1):
-            print(f"  {i}. {risk}")
+    lines.append(_SUMMARY_FOOTER)
+    return "\n".join(lines)
+
+def display_summary(results: Dict[str, Any]):
+    """
+    Display a summary of research results.
     
-    # Display opportunities
-    opportunities = results.get('opportunities', [])
-    if opportunities:
-        print(f"\n🎯 Opportunities:")
-        for i, opp in enumerate(opportunities, 1):
-            print(f"  {i}. {opp}")
+    Args:
+        results: Research results to summarize
+    """
+    sys.stdout.write(format_summary(results))
+
+async def display_summary_async(results: Dict[str, Any]):
+    """
+    Display a summary of research results without blocking the event loop.
     
-    print("\n" + "="*60)
+    Args:
+        results: Research results to summarize
+    """
+    loop = asyncio.get_running_loop()
+    sys.stdout.write(await loop.run_in_executor(_formatter_pool, format_summary, results))
+
+def _read_stdin_line() -> str:
+    """Blocking read of one line from the stdin file descriptor, without input()'s buffer lock."""
+    while b'\n' not in _stdin_pending:
+        chunk = os.read(sys.stdin.fileno(), 4096)
+        if not chunk:
+            if not _stdin_pending:
+                raise EOFError
+            break
+        _stdin_pending.extend(chunk)
+    line, _, rest = bytes(_stdin_pending).partition(b'\n')
+    _stdin_pending[:] = rest
+    return line.decode(sys.stdin.encoding or 'utf-8', errors='replace').rstrip('\r')
+
+async def _run_in_daemon_thread(func, *args):
+    """Await a blocking call on a daemon thread, so an unfinished call never holds up exit."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def settle(outcome, value):
+        if not future.done():
+            outcome(value)
+    
+    def run():
+        try:
+            value = func(*args)
+        except BaseException as e:
+            outcome, value = future.set_exception, e
+        else:
+            outcome = future.set_result
+        try:
+            loop.call_soon_threadsafe(settle, outcome, value)
+        except RuntimeError:
+            pass  # The loop closed before the call finished
+    
+    threading.Thread(target=run, daemon=True).start()
+    return await future
+
+async def _ainput(prompt: str) -> str:
+    """input() replacement that waits for stdin without blocking the event loop."""
+    print(prompt, end='', flush=True)
+    # Reading the raw descriptor on a daemon thread, a prompt still waiting when the
+    # user interrupts neither blocks shutdown nor holds sys.stdin's lock at exit
+    return await _run_in_daemon_thread(_read_stdin_line)
 
 def main():
     """Main execution function."""
+    try:
+        asyncio.run(main_async())
+    except KeyboardInterrupt:
+        print("\n👋 Research interrupted. Goodbye!")
+
+async def main_async():
+    """Interactive research loop; prefetches run while waiting for input."""
     print("🚀 Automated Investment Research Team")
     print("="*50)
     
-    # Setup logging
-    setup_logging()
-    
     # Validate environment
     if not validate_environment():
         sys.exit(1)
     
     # Validate security configuration
-    if not security_manager.validate_api_key(os.getenv('OPENAI_API_KEY'), 'openai'):
+    if not security_manager.validate_api_key(ENV.get('OPENAI_API_KEY'), 'openai'):
         print("❌ Invalid OpenAI API key")
         sys.exit(1)
     
@@ -188,44 +441,72 @@ def main():
     print("2. Research multiple stocks for comparison")
     print("3. Exit")
     
-    while True:
-        try:
-            choice = input("\nEnter your choice (1-3): ").strip()
-            
-            if choice == '1':
-                ticker = input("Enter stock ticker symbol (e.g., AAPL): ").strip().upper()
-                if ticker:
-                    results = research_single_stock(ticker)
-                    display_summary(results)
-                    save_results(results)
-                else:
-                    print("❌ Please enter a valid ticker symbol")
-            
-            elif choice == '2':
-                tickers_input = input("Enter stock ticker symbols separated by commas (e.g., AAPL,MSFT,GOOGL): ").strip()
-                if tickers_input:
-                    tickers = [t.strip().upper() for t in tickers_input.split(',')]
-                    results = research_multiple_stocks(tickers)
-                    save_results(results)
-                    print(f"✅ Comparative research completed for {len(tickers)} stocks")
+    # All research from the prompt and the background prefetches run through one runner,
+    # sharing the OpenAI concurrency budget; queued user requests start first
+    runner = PriorityTaskRunner(int(ENV.get('OPENAI_MAX_CONCURRENCY', 5)))
+    
+    # Keep a reference so the prefetch task isn't garbage collected mid-run
+    prefetch_task = asyncio.create_task(prefetch_top_tickers(runner))
+    
+    try:
+        while True:
+            try:
+                choice = (await _ainput("\nEnter your choice (1-3): ")).strip()
+                
+                if choice == '1':
+                    ticker = (await _ainput("Enter stock ticker symbol (e.g., AAPL): ")).strip().upper()
+                    if ticker:
+                        results = await runner.submit(runner.USER, research_single_stock, ticker)
+                        await display_summary_async(results)
+                        # Large saves sync to disk; keep that wait off the event loop
+                        await asyncio.to_thread(save_results, results)
+                    else:
+                        print("❌ Please enter a valid ticker symbol")
+                
+                elif choice == '2':
+                    tickers_input = (await _ainput("Enter stock ticker symbols separated by commas (e.g., AAPL,MSFT,GOOGL): ")).strip()
+                    if tickers_input:
+                        tickers = [t.strip().upper() for t in tickers_input.split(',')]
+                        
+                        # Research each ticker once and skip malformed ones before any crew runs
+                        tickers = [t for t in dict.fromkeys(tickers) if t]
+                        invalid = [t for t in tickers if not security_manager.validate_ticker_symbol(t)]
+                        if invalid:
+                            print(f"⚠️  Skipping invalid ticker symbols: {', '.join(invalid)}")
+                            tickers = [t for t in tickers if t not in invalid]
+                        
+                        if tickers:
+                            results = await research_multiple_stocks_async(tickers, runner)
+                            await asyncio.to_thread(save_results, results)
+                            print(f"✅ Comparative research completed for {len(tickers)} stocks")
+                        else:
+                            print("❌ Please enter valid ticker symbols")
+                    else:
+                        print("❌ Please enter valid ticker symbols")
+                
+                elif choice == '3':
+                    print("👋 Goodbye!")
+                    break
+                
                 else:
-                    print("❌ Please enter valid ticker symbols")
+                    print("❌ Invalid choice. Please enter 1, 2, or 3.")
             
-            elif choice == '3':
-                print("👋 Goodbye!")
+            except KeyboardInterrupt:
+                print("\n👋 Research interrupted. Goodbye!")
                 break
-            
-            else:
-                print("❌ Invalid choice. Please enter 1, 2, or 3.")
-        
-        except KeyboardInterrupt:
-            print("\n👋 Research interrupted. Goodbye!")
-            break
-        except Exception as e:
-            print(f"❌ Unexpected error: {str(e)}")
+            except Exception as e:
+                print(f"❌ Unexpected error: {str(e)}")
+    finally:
+        # Exiting drops queued prefetches and leaves running crew runs behind
+        prefetch_task.cancel()
+        runner.close()
 
 def demo_mode():
     """Run in demo mode with predefined examples."""
+    asyncio.run(demo_mode_async())
+
+async def demo_mode_async():
+    """Demo pipeline: stocks are researched concurrently, then compared from their results."""
     print("🎯 Running in Demo Mode")
     print("="*30)
     
@@ -233,19 +514,29 @@ def demo_mode():
     demo_stocks = ['AAPL', 'MSFT', 'GOOGL']
     
     print(f"Researching demo stocks: {', '.join(demo_stocks)}")
+    semaphore = asyncio.Semaphore(_get_crew().max_concurrent_research)
     
-    for stock in demo_stocks:
-        print(f"\n🔍 Researching {stock}...")
-        results = research_single_stock(stock)
-        display_summary(results)
-        
-        # Save individual results
-        save_results(results, f"demo_{stock}_research.json")
+    async def research_one(stock: str) -> Tuple[str, Dict[str, Any]]:
+        async with semaphore:
+            print(f"\n🔍 Researching {stock}...")
+            results = await asyncio.to_thread(research_single_stock, stock)
+        # Show each summary as soon as its stock is done
+        await display_summary_async(results)
+        return f"demo_{stock}_research.json", results
+    
+    async def compare(single_tasks: List[asyncio.Task]) -> Tuple[str, Dict[str, Any]]:
+        # Compares the single-stock results themselves, whichever cache or crew run produced
+        # them, instead of starting a second crew run per stock
+        singles = await asyncio.gather(*single_tasks)
+        print(f"\n📊 Running comparative analysis...")
+        results = {stock: research for stock, (_, research) in zip(demo_stocks, singles)}
+        return "demo_comparative_analysis.json", _get_crew().compare_research(demo_stocks, results)
+    
+    single_tasks = [asyncio.create_task(research_one(stock)) for stock in demo_stocks]
+    pending_saves = await asyncio.gather(*single_tasks, compare(single_tasks))
     
-    # Comparative analysis
-    print(f"\n📊 Running comparative analysis...")
-    comparative_results = research_multiple_stocks(demo_stocks)
-    save_results(comparative_results, "demo_comparative_analysis.json")
+    # Save individual and comparative results together
+    await asyncio.to_thread(save_results_batch, pending_saves)
     
     print("\n✅ Demo completed successfully!")
 
@@ -0,0 +1,30 @@
+"""
+Insight Generator Tests
+Regression tests for the ComprehensiveInsights mapping.
+"""
+
+import json
+import pytest
+from agents.insight_generator import InsightGeneratorAgent
+from config.serialization import to_json, from_json
+
+@pytest.fixture
+def insights():
+    news_data = {'ticker_symbol': 'AAPL', 'articles': [], 'sentiment_analysis': {}}
+    report_analysis = {'ticker_symbol': 'AAPL', 'financial_metrics': {}, 'stock_data': {}}
+    return InsightGeneratorAgent().generate_comprehensive_insights(news_data, report_analysis)
+
+def test_insights_behave_as_mapping(insights):
+    assert insights.get('ticker_symbol') == 'AAPL'
+    assert insights.get('missing', 'default') == 'default'
+    assert list(insights.keys()) == list(insights.KEYS)
+    assert dict(insights) == insights.to_dict()
+
+def test_membership_does_not_compute_derived_sections(insights):
+    assert 'summary' in insights
+    assert 'summary' not in insights._cache
+
+def test_insights_serialize_to_json(insights):
+    expected = json.loads(json.dumps(insights.to_dict(), default=str))
+    assert json.loads(json.dumps(insights, default=dict)) == expected
+    assert from_json(to_json(insights)) == expected
\ No newline at end of file
@@ -0,0 +1,30 @@
+"""
+LLM Cache Tests
+Behaviour of the persistent research cache.
+"""
+
+import pytest
+from cache import llm_cache
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, 'CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(llm_cache, 'CACHE_PATH', str(tmp_path / 'llm_cache.sqlite3'))
+    monkeypatch.setattr(llm_cache, '_connection', None)
+    yield
+    if llm_cache._connection is not None:
+        llm_cache._connection.close()
+
+def test_set_then_get():
+    llm_cache.set('key', {'ticker_symbol': 'AAPL'}, ttl=60)
+    assert llm_cache.get('key') == {'ticker_symbol': 'AAPL'}
+    assert llm_cache.get('other') is None
+
+def test_set_replaces_entry():
+    llm_cache.set('key', {'version': 1}, ttl=60)
+    llm_cache.set('key', {'version': 2}, ttl=60)
+    assert llm_cache.get('key') == {'version': 2}
+
+def test_expired_entry_is_missing():
+    llm_cache.set('key', {'ticker_symbol': 'AAPL'}, ttl=-1)
+    assert llm_cache.get('key') is None
\ No newline at end of file
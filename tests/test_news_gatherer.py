@@ -0,0 +1,31 @@
+"""
+News Gatherer Tests
+Regression tests for News API error handling.
+"""
+
+import asyncio
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from agents import news_gatherer
+from agents.news_gatherer import NewsGathererAgent
+
+async def _fetch_from(handler, monkeypatch):
+    app = web.Application()
+    app.router.add_get('/v2/everything', handler)
+    async with TestServer(app) as server:
+        monkeypatch.setattr(news_gatherer, 'NEWSAPI_URL', str(server.make_url('/v2/everything')))
+        async with aiohttp.ClientSession() as session:
+            return await NewsGathererAgent()._fetch_news_api(session, asyncio.BoundedSemaphore(1), {'q': 'AAPL'})
+
+def test_non_json_client_error_is_not_retried(monkeypatch):
+    requests = []
+    
+    async def unauthorized(request):
+        requests.append(request)
+        return web.Response(status=401, text='<html>Unauthorized</html>', content_type='text/html')
+    
+    with pytest.raises(RuntimeError, match='HTTP 401'):
+        asyncio.run(_fetch_from(unauthorized, monkeypatch))
+    assert len(requests) == 1
\ No newline at end of file
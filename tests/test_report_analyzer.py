@@ -0,0 +1,29 @@
+"""
+Report Analyzer Tests
+Regression tests for the yfinance price history cache.
+"""
+
+import pandas as pd
+from agents import report_analyzer
+
+class _FakeTicker:
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.calls = 0
+    
+    def history(self, period):
+        self.calls += 1
+        return self.frames.pop(0)
+
+def test_empty_history_is_fetched_again(monkeypatch):
+    ticker = _FakeTicker([pd.DataFrame(), pd.DataFrame({'Close': [1.0, 2.0]})])
+    monkeypatch.setattr(report_analyzer, '_cached_ticker', lambda symbol, day: ticker)
+    monkeypatch.setattr(report_analyzer, '_history_cache', report_analyzer.LRUCache(maxsize=4))
+    
+    # A failed or throttled fetch comes back empty and must not be memoized
+    assert report_analyzer._cached_history('AAPL', '2026-01-02', '1y').empty
+    assert not report_analyzer._cached_history('AAPL', '2026-01-02', '1y').empty
+    
+    # The non-empty history is then served from the cache
+    assert not report_analyzer._cached_history('AAPL', '2026-01-02', '1y').empty
+    assert ticker.calls == 2
\ No newline at end of file
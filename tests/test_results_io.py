@@ -0,0 +1,30 @@
+"""
+Results File Tests
+Round trips between save_results and load_results.
+"""
+
+import pytest
+import main
+
+RESULTS = {
+    'ticker_symbol': 'AAPL',
+    'recommendations': ['Hold'],
+    'scores': {'confidence': 0.75}
+}
+
+def test_save_load_round_trip_json(tmp_path):
+    filename = str(tmp_path / 'results.json')
+    main.save_results(RESULTS, filename)
+    assert main.load_results(filename) == RESULTS
+
+def test_save_load_round_trip_zst(tmp_path, monkeypatch):
+    pytest.importorskip('zstandard')
+    monkeypatch.setattr(main, 'COMPRESS_RESULTS', True)
+    filename = str(tmp_path / 'results.json')
+    main.save_results(RESULTS, filename)
+    assert main.load_results(filename + '.zst') == RESULTS
+
+def test_load_zst_without_zstandard(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'zstandard', None)
+    with pytest.raises(ImportError, match='zstandard is not installed'):
+        main.load_results(str(tmp_path / 'results.json.zst'))
\ No newline at end of file
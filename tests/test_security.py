@@ -0,0 +1,26 @@
+"""
+Security Module Tests
+Regression tests for input sanitization.
+"""
+
+import pytest
+from config.security import security_manager
+
+@pytest.mark.parametrize('text, expected', [
+    # A tag inside a keyword must not leave the joined keyword behind
+    ('java<script>script:alert(1)', 'alert(1)'),
+    ('onlo<script>ad=evil()', 'evil()'),
+    ('<img src=x on</script>error=alert(1)>', ''),
+    ('javajavascript:script:alert(1)', 'alert(1)'),
+    # Fragments are matched case-insensitively
+    ('JavaScript:alert(1)', 'alert(1)'),
+    ('<SCRIPT>alert(1)</SCRIPT>', 'alert(1)'),
+    ('<div onLoad=x>text</div>', 'text'),
+    # Plain text passes through unchanged
+    ('Apple Inc. (AAPL): P/E = 28', 'Apple Inc. (AAPL): P/E = 28')
+])
+def test_sanitize_input_removes_dangerous_fragments(text, expected):
+    assert security_manager.sanitize_input(text) == expected
+
+def test_sanitize_input_limits_length():
+    assert len(security_manager.sanitize_input('a' * 20000)) == 10000
\ No newline at end of file